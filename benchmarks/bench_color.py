@@ -0,0 +1,100 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+
+Benchmark the sRGB↔Lab lookup-table path against scikit-image.
+
+    python benchmarks/bench_color.py [--frames 500] [--bits 7]
+
+Reports per-frame conversion throughput for 64x64 frames and the maximum
+ΔE (CIE76) of the table over the whole 8-bit sRGB gamut.
+"""
+
+import argparse
+import time
+import warnings
+
+import cv2
+import numpy as np
+from skimage.color import lab2rgb, rgb2lab
+
+from cinechroma.color import _build_lut, lab_to_rgb8, rgb_to_lab
+
+
+def _timeit(fn, frames) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return time.perf_counter() - start
+
+
+def max_delta_e(bits: int, chunk: int = 1 << 20) -> tuple[float, float]:
+    """
+    Max and mean ΔE of the table over all 2**24 sRGB colors.
+    """
+    worst, total = 0.0, 0.0
+    codes = np.arange(1 << 24, dtype=np.uint32)
+
+    for start in range(0, len(codes), chunk):
+        c = codes[start:start + chunk]
+        rgb = np.stack([(c >> 16) & 255, (c >> 8) & 255, c & 255], axis=-1).astype(np.uint8)
+        ref = rgb2lab((rgb / 255.0).reshape(1, -1, 3)).reshape(-1, 3)
+        de = np.linalg.norm(rgb_to_lab(rgb, bits) - ref, axis=1)
+        worst = max(worst, float(de.max()))
+        total += float(de.sum())
+
+    return worst, total / len(codes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--bits", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Smooth frames (upsampled 8x8 noise) look like real footage; white
+    # noise touches the whole table and is the worst case for the LUT
+    noise = rng.integers(0, 256, (args.frames, 64, 64, 3), dtype=np.uint8)
+    smooth = [cv2.resize(f[:8, :8], (64, 64)) for f in noise]
+
+    start = time.perf_counter()
+    _build_lut(args.bits)
+    build = time.perf_counter() - start
+
+    # Load the cached table and fault in its pages before timing
+    rgb_to_lab(np.arange(1 << 24, dtype=np.uint32).view(np.uint8).reshape(-1, 4)[:, :3], args.bits)
+
+    print(f"LUT build ({args.bits} bits)                : {build * 1000:.0f} ms")
+
+    for label, frames in (("smooth", smooth), ("noise", noise)):
+        floats = [f.astype(np.float32) / 255.0 for f in frames]
+        ref = _timeit(lambda f: rgb2lab(f.reshape(1, -1, 3)), floats)
+        lut = _timeit(lambda f: rgb_to_lab(f, args.bits), floats)
+        print(f"[{label:6s}] rgb2lab (skimage, float64): {args.frames / ref:8.0f} frames/s")
+        print(f"[{label:6s}] rgb_to_lab (LUT, float32) : {args.frames / lut:8.0f} frames/s  ({ref / lut:.1f}x)")
+
+    # Reverse direction: one call per color vs one vectorized call
+    labs = rng.uniform([0, -80, -80], [100, 80, 80], (5000, 3))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        ref_rgb = np.array([(np.clip(lab2rgb(c.reshape(1, 1, 3))[0, 0], 0, 1) * 255).astype(np.uint8) for c in labs])
+        ref = time.perf_counter() - start
+    start = time.perf_counter()
+    out_rgb = lab_to_rgb8(labs)
+    vec = time.perf_counter() - start
+
+    print(f"lab2rgb per color                   : {len(labs) / ref:8.0f} colors/s")
+    print(f"lab_to_rgb8 vectorized              : {len(labs) / vec:8.0f} colors/s  ({ref / vec:.0f}x)")
+    print(f"lab_to_rgb8 max code diff           : {np.abs(ref_rgb.astype(int) - out_rgb).max()}")
+
+    worst, mean = max_delta_e(args.bits)
+    print(f"ΔE vs rgb2lab, all 2^24 colors: max {worst:.3f}, mean {mean:.3f}")
+
+
+if __name__ == "__main__":
+    main()
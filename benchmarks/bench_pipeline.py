@@ -0,0 +1,252 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+
+End-to-end benchmark of extract, analyze and render on synthetic inputs.
+
+    python benchmarks/bench_pipeline.py [--duration 60] [--resolution 1280x720] [--out bench.json]
+
+Encodes a deterministic test video from ffmpeg's testsrc2 source, then
+times extract_every_n, _load_frame, _dominant_colors,
+_compute_movie_palettes and render_color_strip (the strip input is a
+NumPy-generated analysis of --strip-frames frames). Each stage reports
+frames/s and its peak RSS as JSON. With --baseline, stages that got
+slower than a previous result by more than --tolerance are listed and
+the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from cinechroma import analyze, extract, render
+from cinechroma.results import ResultWriter
+from cinechroma.ui import console
+from cinechroma.utils import parse_size
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the kernel's peak RSS counter of this process (Linux only), so
+    every stage reports its own peak. Returns False where unsupported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    """
+    Peak RSS since the last reset, else since the process started.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+        return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _children_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(results: dict, name: str, fn) -> object:
+    """
+    Run one stage and record its throughput and peak memory.
+    fn returns (frames processed, value passed on to the next stage).
+    """
+    per_stage = _reset_peak_rss()
+    start = time.perf_counter()
+    frames, value = fn()
+    seconds = time.perf_counter() - start
+    results[name] = {
+        "frames": frames,
+        "seconds": round(seconds, 4),
+        "fps": round(frames / seconds, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "peak_rss_scope": "stage" if per_stage else "process",
+    }
+    return value
+
+
+def make_video(path: Path, duration: float, fps: int, resolution: tuple[int, int]) -> None:
+    """
+    Encode a deterministic synthetic video with ffmpeg's testsrc2 source.
+    """
+    width, height = resolution
+    subprocess.run([
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}:duration={duration}",
+        "-c:v", "libx264", "-preset", "veryfast", "-g", str(2 * fps), "-pix_fmt", "yuv420p",
+        str(path),
+    ], check=True)
+
+
+def write_strip_input(path: Path, dominants: list, count: int, fps: float, seed: int) -> None:
+    """
+    Write an analysis file of `count` frames for render_color_strip,
+    cycling through measured dominant colors with a little noise.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.array([d[0] for d in dominants], dtype=np.float64)
+    colors = base[np.arange(count) % len(base)] + rng.normal(0, 2, (count, 3))
+
+    writer = ResultWriter(str(path))
+    for i, lab in enumerate(colors.round(3).tolist()):
+        writer.write_frame({
+            "frame": f"{i + 1:06d}",
+            "time": i / fps,
+            "dominant_lab": lab,
+            "palette_lab": [lab],
+            "palette_weights": [1.0],
+            "mean_lab": lab,
+        })
+    writer.finish({})
+
+
+def run(args, work: Path) -> dict:
+    video = work / "synthetic.mp4"
+    frames_dir = work / "frames"
+    make_video(video, args.duration, args.fps, args.resolution)
+    decoded = int(args.duration * args.fps)
+    size = analyze.ANALYSIS_SIZE
+    stages = {}
+
+    def extract_stage():
+        extract.extract_every_n(str(video), str(frames_dir), args.every_n)
+        return decoded, sorted(frames_dir.glob("*.png"))
+
+    paths = _measure(stages, "extract_every_n", extract_stage)
+    stages["extract_every_n"]["ffmpeg_peak_rss_mb"] = round(_children_peak_rss_mb(), 1)
+    stages["extract_every_n"]["extracted"] = len(paths)
+
+    def load_stage():
+        return len(paths), [analyze._load_frame(p, size) for p in paths]
+
+    frames = _measure(stages, "load_frame", load_stage)
+
+    def dominant_stage():
+        return len(frames), [analyze._dominant_colors(rgb, args.k) for rgb in frames]
+
+    dominants = _measure(stages, "dominant_colors", dominant_stage)
+
+    # Pixels are pooled outside the timed stage, as the sampler does during analysis
+    rng = np.random.default_rng(args.seed)
+    pixels = np.concatenate([analyze._filter_luminance(analyze._frame_lab(rgb)) for rgb in frames])
+    if len(pixels) > args.palette_sample_size:
+        pixels = pixels[rng.choice(len(pixels), args.palette_sample_size, replace=False)]
+
+    def palette_stage():
+        return len(frames), analyze._compute_movie_palettes(pixels, k=6)
+
+    _measure(stages, "compute_movie_palettes", palette_stage)
+
+    analysis = work / "analysis.json"
+    write_strip_input(analysis, dominants, args.strip_frames, args.fps / args.every_n, args.seed)
+
+    def render_stage():
+        render.render_color_strip(str(analysis), height=400, out_path=str(work / "strip.png"))
+        return args.strip_frames, None
+
+    _measure(stages, "render_color_strip", render_stage)
+    return stages
+
+
+def environment() -> dict:
+    try:
+        version = metadata.version("cinechroma")
+    except metadata.PackageNotFoundError:
+        version = None
+    ffmpeg = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True).stdout.split("\n")[0]
+    return {
+        "cinechroma": version,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "ffmpeg": ffmpeg,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(stages: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Stages whose throughput dropped below (1 - tolerance) of the baseline.
+    """
+    regressions = []
+    for name, stage in stages.items():
+        before = baseline.get("stages", {}).get(name)
+        if before and stage["fps"] < before["fps"] * (1 - tolerance):
+            regressions.append(f"{name}: {stage['fps']:.1f} frames/s vs {before['fps']:.1f} in baseline")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of synthetic video")
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--resolution", type=parse_size, default="1280x720")
+    parser.add_argument("--every-n", type=int, default=24)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--palette-sample-size", type=int, default=100000)
+    parser.add_argument("--strip-frames", type=int, default=100000,
+                        help="Frames in the synthetic analysis rendered as a strip")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="Previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed throughput drop against --baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    console.quiet = True
+    with tempfile.TemporaryDirectory(prefix="cinechroma-bench-") as work:
+        stages = run(args, Path(work))
+
+    report = {
+        "environment": environment(),
+        "config": {
+            "duration": args.duration, "fps": args.fps, "resolution": list(args.resolution),
+            "every_n": args.every_n, "k": args.k, "palette_sample_size": args.palette_sample_size,
+            "strip_frames": args.strip_frames, "seed": args.seed,
+        },
+        "stages": stages,
+    }
+
+    for name, stage in stages.items():
+        print(f"{name:24s}: {stage['fps']:10.1f} frames/s  {stage['seconds']:8.3f} s  "
+              f"peak RSS {stage['peak_rss_mb']:7.1f} MB", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text + "\n")
+
+    if args.baseline:
+        regressions = compare(stages, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
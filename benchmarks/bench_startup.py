@@ -0,0 +1,98 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+
+Benchmark CLI startup time of lightweight commands.
+
+    python benchmarks/bench_startup.py [--runs 20] [--video movie.mp4]
+
+Runs each command in a fresh interpreter and reports the median and
+minimum wall time next to a bare `python -c pass`, plus the heavy
+modules each command ended up importing. info uses --video, or a short
+synthetic clip encoded with ffmpeg.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+# Modules a lightweight command should never need
+HEAVY_MODULES = ("cv2", "sklearn", "skimage", "scipy", "PIL", "numpy", "pyfiglet")
+
+# Runs the CLI in-process, then reports which heavy modules it loaded
+_PROBE = """
+import sys
+from cinechroma import cli
+sys.argv = ["cinechroma"] + sys.argv[1:]
+try:
+    cli.main()
+except SystemExit:
+    pass
+print(__import__("json").dumps([m for m in {heavy!r} if m in sys.modules]), file=sys.stderr)
+"""
+
+
+def _time(cmd: list[str], runs: int) -> tuple[float, float]:
+    """
+    Median and minimum wall time of a command over runs, in ms.
+    """
+    # One untimed run warms the page cache and the probe/banner caches
+    subprocess.run(cmd, capture_output=True)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, capture_output=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), min(times)
+
+
+def _heavy_imports(args: list[str]) -> list[str]:
+    probe = _PROBE.format(heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", probe] + args, capture_output=True, text=True)
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--video", type=str, help="Video for info (default: synthetic clip)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cinechroma-startup-") as work:
+        video = args.video
+        if video is None:
+            video = str(Path(work) / "clip.mp4")
+            subprocess.run([
+                "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                "-f", "lavfi", "-i", "testsrc2=size=320x240:rate=24:duration=1", video,
+            ], check=True)
+
+        commands = {
+            "python -c pass": None,
+            "--version": ["--version"],
+            "info --quiet": ["--quiet", "info", video],
+            "info": ["info", video],
+            "clean --quiet": ["--quiet", "clean", "--frames-dir", str(Path(work) / "none")],
+            "--help": ["--help"],
+        }
+
+        cli = [sys.executable, "-c", "import sys; from cinechroma.cli import main; sys.argv[0] = 'cinechroma'; main()"]
+        for label, cli_args in commands.items():
+            cmd = [sys.executable, "-c", "pass"] if cli_args is None else cli + cli_args
+            median, best = _time(cmd, args.runs)
+            heavy = "" if cli_args is None else ", ".join(_heavy_imports(cli_args)) or "none"
+            print(f"{label:16s}: median {median:7.1f} ms  min {best:7.1f} ms"
+                  f"{f'  heavy imports: {heavy}' if heavy else ''}")
+
+
+if __name__ == "__main__":
+    main()
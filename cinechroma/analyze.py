@@ -7,86 +7,57 @@ See README.md for:
 """
 
 
-import json
-import subprocess
-import shutil
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import cv2
 import numpy as np
 from sklearn.cluster import KMeans
-from skimage.color import rgb2lab
 
+from cinechroma import extract, profiling
+from cinechroma.cache import DecodeCache, FrameCache, frame_key
+from cinechroma.color import LUT_BITS, lab_lut, rgb_to_lab
+from cinechroma.kmeans import batched_kmeans
+from cinechroma.probe import ProbeError, probe
+from cinechroma.results import ResultWriter, output_format
+from cinechroma.sampling import ReservoirSampler
 from cinechroma.ui import console, progress_bar
+from cinechroma.utils import video_fingerprint
 
 
-def get_video_info(video_path: str) -> None:
-    """
-    Display video metadata using ffprobe.
-    """
-    if shutil.which("ffprobe") is None:
-        console.print(
-            "[bold red]✖ ffprobe not found[/bold red]\n"
-            "Please install ffmpeg/ffprobe and ensure it is available in PATH."
-        )
-        raise SystemExit(1)
+# Frames are shrunk to this (width, height) before analysis
+ANALYSIS_SIZE = (64, 64)
 
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,avg_frame_rate,codec_name,pix_fmt,color_primaries,color_transfer",
-        "-show_entries", "format=duration",
-        "-of", "json",
-        video_path
-    ]
+# Frames sent to a worker process per shared-memory block
+BATCH_SIZE = 16
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-    except subprocess.CalledProcessError as e:
-        console.print(f"[red]✖ ffprobe failed: {e}[/red]")
-        raise SystemExit(1)
-    except json.JSONDecodeError:
-        console.print("[red]✖ Failed to parse ffprobe output[/red]")
-        raise SystemExit(1)
+# Pixels outside this Lab luminance range are ignored
+LUMINANCE_RANGE = (5, 95)
 
-    # Extract metadata
-    stream = data.get("streams", [{}])[0]
-    format_info = data.get("format", {})
+# Fraction of the frame height checked for letterbox bars
+LETTERBOX_REGION = 0.1
 
-    width = stream.get("width", "N/A")
-    height = stream.get("height", "N/A")
-    codec = stream.get("codec_name", "N/A")
-    pix_fmt = stream.get("pix_fmt", "N/A")
-    color_primaries = stream.get("color_primaries", "N/A")
-    color_transfer = stream.get("color_transfer", "N/A")
-    
-    # Parse FPS (avg_frame_rate is a fraction like "24000/1001")
-    fps_str = stream.get("avg_frame_rate", "0/1")
-    try:
-        num, denom = map(int, fps_str.split("/"))
-        fps = num / denom if denom != 0 else 0
-    except (ValueError, ZeroDivisionError):
-        fps = 0
+# Thumbnail (width, height) compared to spot near-duplicate frames
+SIGNATURE_SIZE = (8, 8)
 
-    # Parse duration
-    duration_str = format_info.get("duration", "0")
-    try:
-        duration = float(duration_str)
-    except ValueError:
-        duration = 0
-
-    # Display using Rich
-    console.print("\n[bold cyan]📹 Video Information[/bold cyan]\n")
-    console.print(f"  [bold]Resolution:[/bold]       {width} × {height}")
-    console.print(f"  [bold]Duration:[/bold]         {duration:.2f} seconds")
-    console.print(f"  [bold]FPS:[/bold]              {fps:.2f}")
-    console.print(f"  [bold]Codec:[/bold]            {codec}")
-    console.print(f"  [bold]Pixel Format:[/bold]    {pix_fmt}")
-    console.print(f"  [bold]Color Primaries:[/bold] {color_primaries}")
-    console.print(f"  [bold]Color Transfer:[/bold]  {color_transfer}")
-    console.print()
+# Image files read from a frames directory
+FRAME_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+# Frames loaded ahead of the analysis loop from a frames directory,
+# which caps the memory they take while hiding disk and decode time
+READ_AHEAD = 16
+
+# cv2.imread flags that let libjpeg decode at 1/2, 1/4 or 1/8 scale
+_JPEG_REDUCED = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
 
 
 def _get_fps(video_path: str) -> float:
@@ -94,42 +65,304 @@ def _get_fps(video_path: str) -> float:
     Get the FPS of a video using ffprobe.
     Returns 24.0 as fallback if detection fails.
     """
-    if shutil.which("ffprobe") is None:
-        console.print("[yellow]⚠ ffprobe not found, assuming 24 FPS[/yellow]")
+    try:
+        fps = probe(video_path).fps
+    except ProbeError as e:
+        console.print(f"[yellow]⚠ {e}, assuming 24 FPS[/yellow]")
         return 24.0
 
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=avg_frame_rate",
-        "-of", "json",
-        video_path
-    ]
-
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        fps_str = data.get("streams", [{}])[0].get("avg_frame_rate", "24/1")
-        num, denom = map(int, fps_str.split("/"))
-        fps = num / denom if denom != 0 else 24.0
-        return fps
-    except (subprocess.CalledProcessError, json.JSONDecodeError, ValueError, ZeroDivisionError, KeyError):
+    if fps is None:
         console.print("[yellow]⚠ Could not detect FPS, assuming 24 FPS[/yellow]")
         return 24.0
+    return fps
 
 
-def _load_frame(path: Path) -> np.ndarray:
+def _prepare_frame(img: np.ndarray, size: tuple[int, int] = ANALYSIS_SIZE) -> np.ndarray:
+    """
+    Resize an RGB uint8 frame and convert it to a float array.
+    Frames already decoded at the analysis size are not resized again.
+    """
+    if img.shape[1::-1] != tuple(size):
+        img = cv2.resize(img, size)
+    return img.astype(np.float32) / 255.0
+
+
+def _load_frame(path: Path, size: tuple[int, int] = ANALYSIS_SIZE, flag: int = cv2.IMREAD_COLOR) -> np.ndarray:
     """
     Load an image, resize, convert to RGB float array.
     """
-    img = cv2.imread(str(path))
+    img = cv2.imread(str(path), flag)
     img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    img = cv2.resize(img, (64, 64))
-    return img.astype(np.float32) / 255.0
+    return _prepare_frame(img, size)
+
+
+def _frame_paths(frames_dir: str) -> list[Path]:
+    """
+    Frame images of a frames directory, in frame order.
+    """
+    folder = Path(frames_dir)
+    if not folder.is_dir():
+        return []
+    return sorted(p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in FRAME_EXTENSIONS)
+
+
+def _imread_flag(path: Path, size: tuple[int, int]) -> int:
+    """
+    cv2.imread flag for frames like `path`: JPEGs are decoded at the
+    smallest 1/2, 1/4 or 1/8 scale that is still at least the analysis
+    size, so libjpeg skips most of the work. Other formats have no
+    cheaper reduced decode and are read in full.
+    """
+    if path.suffix.lower() not in (".jpg", ".jpeg"):
+        return cv2.IMREAD_COLOR
+    img = cv2.imread(str(path))
+    if img is None:
+        return cv2.IMREAD_COLOR
+    height, width = img.shape[:2]
+    for factor, flag in _JPEG_REDUCED.items():
+        if width // factor >= size[0] and height // factor >= size[1]:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def _read_ahead(paths: list[Path], size: tuple[int, int], depth: int = READ_AHEAD):
+    """
+    Yield (path, rgb) for every path, loaded by a thread pool up to
+    `depth` frames ahead of the consumer, so reading and decoding the
+    next frames overlaps analysis of the current one.
+    """
+    flag = _imread_flag(paths[0], size) if paths else cv2.IMREAD_COLOR
+
+    def load(path):
+        with profiling.span("load_frame"):
+            return _load_frame(path, size, flag)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=min(depth, os.cpu_count() or 1)) as pool:
+        try:
+            for path in paths:
+                # A full queue waits for its oldest frame before reading further
+                if len(pending) >= depth:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+                pending.append((path, pool.submit(load, path)))
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _analysis_size(args) -> tuple[int, int]:
+    """
+    Resolution frames are analyzed at: --size, else the size recorded by
+    extract, else ANALYSIS_SIZE.
+    """
+    if args.size:
+        return tuple(args.size)
+    if not args.stream:
+        manifest = extract.read_manifest(args.frames_dir)
+        if manifest.get("size"):
+            return tuple(manifest["size"])
+    return ANALYSIS_SIZE
+
+
+def _sampling_mode(args) -> str:
+    """
+    Frame selection of a run, as recorded in extraction manifests.
+    """
+    if args.shots is not None:
+        return f"shots-{args.shots}"
+    if args.interval is not None:
+        return f"interval-{args.interval}{'-keyframes' if args.snap_keyframes else ''}"
+    return "keyframes" if args.keyframes else f"every-{args.every_n or 24}"
+
+
+def _crop_mode(args) -> str:
+    """
+    Crop of the analyzed frames: --crop when streaming. Frames in a
+    directory were cropped, if at all, when they were extracted.
+    """
+    if args.stream:
+        return args.crop
+    extracted = extract.read_manifest(args.frames_dir).get("crop") or "frame"
+    if extracted in ("frame", "none"):
+        # Whole frames; letterbox removal is still up to --crop
+        if args.crop in ("frame", "none"):
+            return args.crop
+        console.print(
+            f"[yellow]⚠ Frames in {args.frames_dir} were extracted uncropped; "
+            f"run extract with --crop {args.crop} to crop them[/yellow]"
+        )
+        return "frame"
+    if args.crop not in ("frame", extracted):
+        console.print(
+            f"[yellow]⚠ Frames in {args.frames_dir} were extracted with --crop {extracted}; "
+            f"run extract again to change it[/yellow]"
+        )
+    return extracted
+
+
+def _span_key(args) -> str | None:
+    """
+    Manifest and decode cache key of the span every frame stands for:
+    "shots" with --shots, "samples" with --interval. A frames directory
+    is read the way it was extracted.
+    """
+    if not args.stream:
+        manifest = extract.read_manifest(args.frames_dir)
+        return next((key for key in ("shots", "samples") if manifest.get(key)), None)
+    if args.shots is not None:
+        return "shots"
+    if args.interval is not None:
+        return "samples"
+    return None
+
+
+def _decoded_frames(args, size: tuple[int, int], spans: list):
+    """
+    Stream uint8 frames from ffmpeg, resized to the analysis size.
+    With --shots or --interval, each frame's span record is appended to spans.
+    """
+    # With --interp, ffmpeg does the downscale in its filter graph
+    decode_size = size if args.interp else None
+    # A video-level crop is cut out by ffmpeg, before any scaling
+    crop = extract.resolve_crop(args.video, args.crop)
+    if args.crop == "auto":
+        console.print(f"  Crop   : {extract.describe_crop(crop)} detected in {Path(args.video).name}")
+    if args.shots is not None:
+        frames = extract.stream_shots(args.video, args.shots, decode_size, args.interp, crop)
+    elif args.interval is not None:
+        frames = extract.stream_interval(args.video, args.interval, decode_size, args.interp or "area",
+                                         args.snap_keyframes, crop)
+    else:
+        frames = ((img, None) for img in extract.stream_frames(
+            args.video, args.every_n or 24, args.keyframes, decode_size, args.interp, crop))
 
+    for img, span in frames:
+        if span is not None:
+            spans.append(span)
+        yield img if img.shape[1::-1] == tuple(size) else cv2.resize(img, size)
 
-def _filter_luminance(lab_pixels: np.ndarray, min_l: float = 5, max_l: float = 95) -> np.ndarray:
+
+def _decode_key(args, size: tuple[int, int]) -> str:
+    """
+    Decode cache key: source video content, frame selection, cropping
+    and resizing.
+    """
+    mode = _sampling_mode(args)
+    if args.crop not in ("frame", "none"):
+        mode += f"-crop-{args.crop}"
+    return DecodeCache.key(
+        video_fingerprint(args.video),
+        mode,
+        size,
+        args.interp or "resize",
+    )
+
+
+def _decode_meta(args, spans: list) -> dict:
+    """
+    Decode cache metadata; spans is filled in while frames are decoded.
+    """
+    meta = {"video": str(args.video), "mode": _sampling_mode(args)}
+    if _span_key(args):
+        meta[_span_key(args)] = spans
+    return meta
+
+
+def predecode(args) -> int:
+    """
+    Decode a video into the decode cache ahead of a --stream analysis,
+    so the analysis itself does not invoke ffmpeg.
+    Returns the number of frames, or 0 if it was already cached.
+    """
+    size = _analysis_size(args)
+    decode_cache = DecodeCache(args.decode_cache_size)
+    key = _decode_key(args, size)
+    if decode_cache.get(key) is not None:
+        return 0
+
+    spans = []
+    count = 0
+    for _ in decode_cache.store(key, _decoded_frames(args, size, spans), _decode_meta(args, spans)):
+        count += 1
+    return count
+
+
+def _manifest_spans(frames_dir: str, count: int) -> list[dict]:
+    """
+    Shot or sample records of a frames directory extracted with
+    --shots or --interval.
+    """
+    manifest = extract.read_manifest(frames_dir)
+    spans = manifest.get("shots") or manifest.get("samples") or []
+    if spans and len(spans) != count:
+        console.print(f"[yellow]⚠ {frames_dir} holds {count} frames for {len(spans)} spans; ignoring span durations[/yellow]")
+        return []
+    return spans
+
+
+def _check_frames_dir(args) -> None:
+    """
+    Make sure a frames directory was extracted from the analyzed video.
+    """
+    manifest = extract.read_manifest(args.frames_dir)
+    if not manifest.get("fingerprint"):
+        console.print(f"[yellow]⚠ {args.frames_dir} has no extraction manifest; cannot verify it matches {args.video}[/yellow]")
+        return
+    if Path(args.video).exists() and manifest["fingerprint"] != video_fingerprint(args.video):
+        console.print(
+            f"[red]✖ Frames in {args.frames_dir} were extracted from {manifest.get('video')}, "
+            f"not {args.video}. Run extract again.[/red]"
+        )
+        raise SystemExit(1)
+
+
+def _iter_frames(args, decode_cache: DecodeCache | None = None, spans: list | None = None):
+    """
+    Yield (name, rgb) pairs for every frame to analyze.
+
+    Frames come from the frames directory, loaded a few frames ahead
+    in background threads, or straight from ffmpeg when streaming, and
+    are resized to the analysis size unless they
+    were decoded at that size already. Streamed frames are served from
+    the decode cache when this video was decoded the same way before.
+    With shot or interval sampling, spans receives the span record of
+    every frame, at the latest when that frame is yielded.
+    """
+    size = _analysis_size(args)
+    spans = [] if spans is None else spans
+
+    if args.stream:
+        frames = _decoded_frames(args, size, spans)
+        if decode_cache is not None:
+            key = _decode_key(args, size)
+            cached = decode_cache.get(key)
+            if cached is not None:
+                frames, meta = cached
+                console.print(f"  Decode : {len(frames)} frames from cache")
+                spans.extend(meta.get(_span_key(args) or "") or [])
+                frames = iter(frames)
+            else:
+                frames = decode_cache.store(key, frames, _decode_meta(args, spans))
+        for i, img in enumerate(profiling.timed(frames, "decode")):
+            with profiling.span("prepare"):
+                rgb = _prepare_frame(img, size)
+            yield f"{i + 1:06d}", rgb
+    else:
+        paths = _frame_paths(args.frames_dir)
+        spans.extend(_manifest_spans(args.frames_dir, len(paths)))
+        for path, rgb in profiling.timed(_read_ahead(paths, size), "load_wait"):
+            yield path.name, rgb
+
+
+def _filter_luminance(
+    lab_pixels: np.ndarray,
+    min_l: float = LUMINANCE_RANGE[0],
+    max_l: float = LUMINANCE_RANGE[1],
+) -> np.ndarray:
     """
     Filter out extreme blacks and whites in Lab color space.
     Returns only pixels with luminance in [min_l, max_l].
@@ -147,7 +380,7 @@ def _detect_letterbox(rgb: np.ndarray) -> tuple[int, int]:
     Uses simple heuristic: check if top/bottom 10% regions are very dark.
     """
     h, w = rgb.shape[:2]
-    crop_region = int(h * 0.1)
+    crop_region = int(h * LETTERBOX_REGION)
     
     if crop_region == 0:
         return (0, 0)
@@ -193,44 +426,64 @@ def _remove_letterbox(rgb: np.ndarray) -> np.ndarray:
         return rgb
 
 
-def _dominant_colors(rgb: np.ndarray, k: int):
+def _frame_lab(rgb: np.ndarray) -> np.ndarray:
     """
-    Extract dominant colors using KMeans in Lab space.
-    Filters extreme blacks and whites before clustering.
+    Convert an RGB frame to a flat (N, 3) float32 array of Lab pixels.
+    """
+    return rgb_to_lab(rgb).reshape(-1, 3)
+
+
+def _lab_histogram(lab: np.ndarray, bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bin Lab pixels into a bins³ histogram over L [0, 100] and a, b [-128, 128].
+
+    Returns (centers, counts) of the occupied bins only, where each center
+    is the mean of the pixels that fell into the bin.
+    """
+    lo = np.array([0, -128, -128], dtype=np.float32)
+    span = np.array([100, 256, 256], dtype=np.float32)
+
+    idx = np.clip(((lab - lo) / span * bins).astype(np.intp), 0, bins - 1)
+    flat = (idx[:, 0] * bins + idx[:, 1]) * bins + idx[:, 2]
+
+    counts = np.bincount(flat, minlength=bins ** 3)
+    occupied = np.flatnonzero(counts)
+    sums = np.stack([
+        np.bincount(flat, weights=lab[:, j], minlength=bins ** 3)[occupied]
+        for j in range(3)
+    ], axis=1)
+
+    counts = counts[occupied]
+    return sums / counts[:, None], counts
+
+
+def _cluster_palette(lab: np.ndarray, k: int, weights: np.ndarray | None = None) -> tuple[list, list]:
+    """
+    Cluster filtered Lab pixels with KMeans, optionally weighted.
+    Returns (centers, shares): cluster centers ordered by cluster size,
+    largest first, and the fraction of pixels in each cluster.
     """
-    pixels = rgb.reshape(-1, 3)
-    lab = rgb2lab(pixels.reshape(1, -1, 3)).reshape(-1, 3)
-    
-    # Filter extreme luminance values
-    lab = _filter_luminance(lab)
-    
     # Adjust k if we don't have enough pixels
     n_samples = len(lab)
     actual_k = min(k, n_samples)
     
     if actual_k < 1:
         # Fallback to a neutral gray if no valid pixels
-        return [[50, 0, 0]]
+        return [[50, 0, 0]], [1.0]
 
     km = KMeans(n_clusters=actual_k, n_init='auto', random_state=0)
-    labels = km.fit_predict(lab)
+    labels = km.fit_predict(lab, sample_weight=weights)
 
-    counts = np.bincount(labels)
+    counts = np.bincount(labels, weights=weights, minlength=actual_k)
     order = np.argsort(-counts)
 
-    return km.cluster_centers_[order].tolist()
+    return km.cluster_centers_[order].tolist(), (counts[order] / counts.sum()).tolist()
 
 
-def _mean_color(rgb: np.ndarray):
+def _mean_lab(lab_pixels: np.ndarray) -> list:
     """
-    Compute mean color in Lab space, filtering extreme luminance.
+    Mean of filtered Lab pixels, neutral gray if there are none.
     """
-    lab = rgb2lab(rgb)
-    lab_pixels = lab.reshape(-1, 3)
-    
-    # Filter extreme luminance values
-    lab_pixels = _filter_luminance(lab_pixels)
-    
     if len(lab_pixels) == 0:
         # Fallback to neutral gray if all pixels filtered
         return [50, 0, 0]
@@ -238,142 +491,576 @@ def _mean_color(rgb: np.ndarray):
     return lab_pixels.mean(axis=0).tolist()
 
 
-def _compute_movie_palettes(all_lab_pixels: np.ndarray, k: int = 6) -> dict:
+def _dominant_colors(rgb: np.ndarray, k: int):
+    """
+    Extract dominant colors using KMeans in Lab space.
+    Filters extreme blacks and whites before clustering.
+    """
+    lab = _filter_luminance(_frame_lab(rgb))
+    return _cluster_palette(lab, k)[0]
+
+
+def _mean_color(rgb: np.ndarray):
+    """
+    Compute mean color in Lab space, filtering extreme luminance.
+    """
+    lab_pixels = _filter_luminance(_frame_lab(rgb))
+    return _mean_lab(lab_pixels)
+
+
+def _frame_features(rgb: np.ndarray, k: int) -> dict:
+    """
+    Compute every per-frame result from a single pass over the frame.
+
+    The frame is converted to Lab, luminance-filtered and clustered once;
+    dominant color, palette, mean and the filtered pixels that feed the
+    movie-level palettes all come from those shared intermediates.
+    """
+    lab = _filter_luminance(_frame_lab(rgb))
+    return _features(lab, _cluster_palette(lab, k))
+
+
+def _features(lab: np.ndarray, palette: tuple[list, list]) -> dict:
+    """
+    Assemble the per-frame results from filtered Lab pixels and their
+    (centers, shares) palette.
+    """
+    centers, shares = palette
+    return {
+        "dominant_lab": centers[0],
+        "palette_lab": centers,
+        "palette_weights": shares,
+        "mean_lab": _mean_lab(lab),
+        "pixels": lab,
+    }
+
+
+def _batched_palettes(labs: list[np.ndarray], k: int, weights: list[np.ndarray] | None = None) -> list[tuple]:
+    """
+    Cluster the filtered Lab pixels of several frames in one batched
+    k-means run. Returns one (centers, shares) palette per frame,
+    largest cluster first.
+    """
+    n = max(len(lab) for lab in labs)
+    x = np.zeros((len(labs), n, 3), dtype=np.float32)
+    mask = np.zeros((len(labs), n), dtype=bool)
+    w = None if weights is None else np.zeros((len(labs), n), dtype=np.float32)
+    for j, lab in enumerate(labs):
+        x[j, :len(lab)] = lab
+        mask[j, :len(lab)] = True
+        if w is not None:
+            w[j, :len(lab)] = weights[j]
+
+    centers, counts, ks = batched_kmeans(x, mask, k, weights=w)
+
+    palettes = []
+    for j in range(len(labs)):
+        if not ks[j]:
+            # Fallback to a neutral gray for frames without valid pixels
+            palettes.append(([[50, 0, 0]], [1.0]))
+            continue
+        sizes = counts[j, :ks[j]]
+        palettes.append((centers[j, :ks[j]].tolist(), (sizes / sizes.sum()).tolist()))
+    return palettes
+
+
+def _fit_palette(pixels: np.ndarray, k: int, weights: np.ndarray | None = None, init="k-means++"):
+    """
+    Fit one KMeans palette.
+    Returns (centers, sizes) ordered by cluster size, or empty arrays
+    when there are fewer than k pixels.
+    """
+    if len(pixels) < k:
+        return np.empty((0, 3)), np.empty(0)
+
+    n_init = 1 if isinstance(init, np.ndarray) else 'auto'
+    km = KMeans(n_clusters=k, init=init, n_init=n_init, random_state=0)
+    km.fit(pixels, sample_weight=weights)
+    counts = np.bincount(km.labels_, weights=weights, minlength=k)
+    order = np.argsort(-counts)
+    return km.cluster_centers_[order], counts[order]
+
+
+def _compute_movie_palettes(
+    all_lab_pixels: np.ndarray,
+    k: int = 6,
+    overall: str = "refit",
+    weights: np.ndarray | None = None,
+) -> dict:
     """
     Generate movie-level color palettes by luminance bands.
     
     Args:
         all_lab_pixels: Aggregated Lab pixels from all frames (Nx3)
         k: Number of clusters per band
+        overall: How the overall palette is built:
+            "refit" clusters all pixels again, concurrently with the bands;
+            "seeded" starts that fit from the largest band centroids;
+            "hierarchical" clusters the band centroids, weighted by size
+        weights: Optional per-pixel weights, e.g. the length of the shot
+            a pixel was sampled from
     
     Returns:
         Dictionary with 'light', 'medium', 'dark', and 'overall' palettes
     """
-    palettes = {}
-    
     # Define luminance bands
-    light_mask = all_lab_pixels[:, 0] > 70
-    medium_mask = (all_lab_pixels[:, 0] > 30) & (all_lab_pixels[:, 0] <= 70)
-    dark_mask = all_lab_pixels[:, 0] <= 30
-    
-    # Light palette
-    light_pixels = all_lab_pixels[light_mask]
-    if len(light_pixels) >= k:
-        km = KMeans(n_clusters=k, n_init='auto', random_state=0)
-        km.fit(light_pixels)
-        counts = np.bincount(km.labels_)
-        order = np.argsort(-counts)
-        palettes['light'] = km.cluster_centers_[order].tolist()
-    else:
-        palettes['light'] = []
-    
-    # Medium palette
-    medium_pixels = all_lab_pixels[medium_mask]
-    if len(medium_pixels) >= k:
-        km = KMeans(n_clusters=k, n_init='auto', random_state=0)
-        km.fit(medium_pixels)
-        counts = np.bincount(km.labels_)
-        order = np.argsort(-counts)
-        palettes['medium'] = km.cluster_centers_[order].tolist()
-    else:
-        palettes['medium'] = []
+    lum = all_lab_pixels[:, 0]
+    bands = {
+        'light': lum > 70,
+        'medium': (lum > 30) & (lum <= 70),
+        'dark': lum <= 30,
+    }
     
-    # Dark palette
-    dark_pixels = all_lab_pixels[dark_mask]
-    if len(dark_pixels) >= k:
-        km = KMeans(n_clusters=k, n_init='auto', random_state=0)
-        km.fit(dark_pixels)
-        counts = np.bincount(km.labels_)
-        order = np.argsort(-counts)
-        palettes['dark'] = km.cluster_centers_[order].tolist()
-    else:
-        palettes['dark'] = []
+    # KMeans releases the GIL, so the band fits run side by side
+    with ThreadPoolExecutor(max_workers=len(bands) + 1) as pool:
+        futures = {
+            name: pool.submit(_fit_palette, all_lab_pixels[mask], k, None if weights is None else weights[mask])
+            for name, mask in bands.items()
+        }
+        if overall == "refit":
+            futures['overall'] = pool.submit(_fit_palette, all_lab_pixels, k, weights)
+        fits = {name: future.result() for name, future in futures.items()}
     
-    # Overall palette (all pixels)
-    if len(all_lab_pixels) >= k:
-        km = KMeans(n_clusters=k, n_init='auto', random_state=0)
-        km.fit(all_lab_pixels)
-        counts = np.bincount(km.labels_)
-        order = np.argsort(-counts)
-        palettes['overall'] = km.cluster_centers_[order].tolist()
-    else:
-        palettes['overall'] = []
+    if overall != "refit":
+        centers = np.vstack([fits[name][0] for name in bands])
+        sizes = np.concatenate([fits[name][1] for name in bands])
+        if len(centers) < k:
+            fits['overall'] = _fit_palette(all_lab_pixels, k, weights)
+        elif overall == "hierarchical":
+            fits['overall'] = _fit_palette(centers, k, weights=sizes)
+        else:
+            init = centers[np.argsort(-sizes, kind="stable")[:k]]
+            fits['overall'] = _fit_palette(all_lab_pixels, k, weights, init=init)
     
-    return palettes
+    return {name: fits[name][0].tolist() for name in ('light', 'medium', 'dark', 'overall')}
+
+
+def _analysis_params(args) -> dict:
+    """
+    Settings that determine per-frame results, passed to every batch.
+    Per-frame letterbox removal only runs with --crop frame.
+    """
+    crop = _crop_mode(args)
+    return {
+        "k": args.k,
+        "backend": args.cluster_backend,
+        "hist_bins": args.hist_bins,
+        "size": list(_analysis_size(args)),
+        "luminance": list(LUMINANCE_RANGE),
+        "letterbox": LETTERBOX_REGION if crop == "frame" else 0,
+        "crop": crop,
+        "lut_bits": LUT_BITS,
+    }
+
+
+def _cluster_frames(labs: list[np.ndarray], params: dict) -> list[tuple]:
+    """
+    Palettes for the filtered Lab pixels of several frames.
+
+    The "batched" backend clusters all frames in one k-means run.
+    With hist_bins, each frame is clustered as a weighted Lab histogram,
+    so clustering cost follows the number of distinct colors, not pixels.
+    """
+    points, weights = labs, None
+    if params["hist_bins"]:
+        hists = [_lab_histogram(lab, params["hist_bins"]) for lab in labs]
+        points = [centers for centers, _ in hists]
+        weights = [counts for _, counts in hists]
+
+    if params["backend"] == "batched":
+        return _batched_palettes(points, params["k"], weights)
+    if weights is None:
+        return [_cluster_palette(lab, params["k"]) for lab in points]
+    return [_cluster_palette(p, params["k"], w) for p, w in zip(points, weights)]
+
+
+def _analyze_batch(frames, params: dict, known: list | None = None) -> list[dict]:
+    """
+    Remove letterbox bars and compute the features of a batch of frames.
+    Frames with a known palette (from the frame cache) skip clustering.
+    """
+    labs = []
+    for rgb in frames:
+        if params["letterbox"]:
+            with profiling.span("letterbox"):
+                rgb = _remove_letterbox(rgb)
+        with profiling.span("lab"):
+            labs.append(_filter_luminance(_frame_lab(rgb)))
+
+    palettes = list(known) if known else [None] * len(labs)
+    todo = [j for j, palette in enumerate(palettes) if palette is None]
+    if todo:
+        with profiling.span("cluster", len(todo)):
+            for j, palette in zip(todo, _cluster_frames([labs[j] for j in todo], params)):
+                palettes[j] = palette
+
+    with profiling.span("features", len(labs)):
+        return [_features(lab, palette) for lab, palette in zip(labs, palettes)]
+
+
+def _batches(frames, size: int = BATCH_SIZE):
+    """
+    Group (name, rgb) pairs into (names, rgbs) lists of up to size frames.
+    """
+    names, batch = [], []
+    for name, rgb in frames:
+        names.append(name)
+        batch.append(rgb)
+        if len(batch) == size:
+            yield names, batch
+            names, batch = [], []
+    if batch:
+        yield names, batch
+
+
+def _init_worker() -> None:
+    """
+    Keep each worker process single-threaded so N workers use N cores,
+    and load the Lab lookup table before the first batch arrives.
+    """
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+    lab_lut(LUT_BITS)
+
+
+def process_pool(workers: int, initializer=_init_worker) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers are forked from a forkserver where available.
+
+    Forking this process directly while another thread is spawning ffmpeg
+    or ffprobe (e.g. batch decode threads) can leak that spawn's pipe into
+    a worker and hang the spawn forever. The forkserver preloads this module,
+    so workers still start without importing it again.
+    """
+    context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+    return ProcessPoolExecutor(max_workers=workers, initializer=initializer, mp_context=context)
+
+
+def _analyze_shared_batch(shm_name: str, shape: tuple, params: dict, known: list,
+                          profile: bool = False) -> tuple[list[dict], float, list[tuple]]:
+    """
+    Worker entry point: analyze a batch of frames stored in shared memory.
+    Returns the results, the seconds spent analyzing them and, with
+    profile, the profiling events of the batch.
+
+    The filtered Lab pixels of every frame are written back over that
+    frame in the block, and its result only carries their count, so
+    pixel data is not pickled in either direction.
+    """
+    if profile:
+        profiling.enable()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frames = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        started = time.perf_counter()
+        results = _analyze_batch(frames, params, known)
+        seconds = time.perf_counter() - started
+        # Filtered pixels never outnumber a frame's own pixels
+        pixels = frames.reshape(shape[0], -1, 3)
+        for j, features in enumerate(results):
+            count = len(features["pixels"])
+            pixels[j, :count] = features["pixels"]
+            features["pixels"] = count
+        # Release the views before closing the block
+        del frames, pixels
+        return results, seconds, profiling.disable()
+    finally:
+        shm.close()
+
+
+def _submit_batch(pool: ProcessPoolExecutor, batch: list[np.ndarray], params: dict, known: list):
+    """
+    Copy a batch of frames into a new shared-memory block and queue it.
+    Returns (shm, shape, future); the caller unlinks the block once done.
+    """
+    shape = (len(batch),) + batch[0].shape
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+    frames = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+    frames[:] = batch
+    del frames
+    return shm, shape, pool.submit(_analyze_shared_batch, shm.name, shape, params, known, profiling.enabled())
+
+
+def _shared_pixels(shm: shared_memory.SharedMemory, shape: tuple, results: list[dict]) -> None:
+    """
+    Swap the pixel counts in results from _analyze_shared_batch for the
+    Lab pixels the worker left in the block.
+    """
+    pixels = np.ndarray(shape, dtype=np.float32, buffer=shm.buf).reshape(shape[0], -1, 3)
+    for j, features in enumerate(results):
+        features["pixels"] = pixels[j, :features["pixels"]].copy()
+    del pixels
+
+
+def _analyze_frames(frames, params: dict, workers: int = 1, cache: FrameCache | None = None,
+                    stats: dict | None = None):
+    """
+    Yield (name, features) for every (name, rgb) frame, in frame order.
+
+    Frames are grouped in batches of BATCH_SIZE. With more than one worker,
+    batches are handed to a process pool through shared memory, so pixel
+    data is never pickled. At most two batches per worker are in flight.
+    With a cache, palettes of frames seen before are reused and new ones
+    are stored as they finish. stats, if given, accumulates the frames
+    analyzed and the seconds spent analyzing them, in workers or not.
+    """
+    stats = {"frames": 0, "seconds": 0.0} if stats is None else stats
+
+    def measure(batch, seconds):
+        stats["frames"] += len(batch)
+        stats["seconds"] += seconds
+
+    def lookup(batch):
+        if cache is None:
+            return None, None
+        with profiling.span("frame_cache", len(batch)):
+            keys = [frame_key(rgb) for rgb in batch]
+            return keys, [cache.get(key) for key in keys]
+
+    def finish(names, keys, known, results):
+        if cache is not None:
+            with profiling.span("frame_cache", 0):
+                for key, palette, features in zip(keys, known, results):
+                    if palette is None:
+                        cache.put(key, (features["palette_lab"], features["palette_weights"]))
+        return zip(names, results)
+
+    if workers <= 1:
+        for names, batch in _batches(frames):
+            keys, known = lookup(batch)
+            started = time.perf_counter()
+            results = _analyze_batch(batch, params, known)
+            measure(results, time.perf_counter() - started)
+            yield from finish(names, keys, known, results)
+        return
+
+    pending = deque()
+
+    def drain():
+        names, keys, known, shm, shape, future = pending.popleft()
+        try:
+            results, seconds, events = future.result()
+            _shared_pixels(shm, shape, results)
+            measure(results, seconds)
+        finally:
+            shm.close()
+            shm.unlink()
+        profiling.merge(events)
+        yield from finish(names, keys, known, results)
+
+    with process_pool(workers) as pool:
+        try:
+            for names, batch in _batches(frames):
+                keys, known = lookup(batch)
+                pending.append((names, keys, known, *_submit_batch(pool, batch, params, known)))
+                if len(pending) >= workers * 2:
+                    yield from drain()
+
+            while pending:
+                yield from drain()
+        finally:
+            # Free blocks of batches that never completed
+            for *_, shm, _, future in pending:
+                future.cancel()
+                shm.close()
+                shm.unlink()
+
+
+def _signature(rgb: np.ndarray) -> np.ndarray:
+    """
+    Cheap frame signature: an area-averaged thumbnail in 8-bit levels.
+    """
+    return cv2.resize(rgb, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA) * 255.0
+
+
+def _skip_duplicates(frames, threshold: float, groups: deque):
+    """
+    Drop frames whose signature is within threshold (largest absolute
+    difference of any thumbnail cell, in 8-bit levels) of the last frame
+    passed on, so local motion still counts as a change.
+
+    groups gets one list per frame passed on; names of the near-duplicates
+    that follow it are added to that list.
+    """
+    reference = None
+    for name, rgb in frames:
+        signature = _signature(rgb) if threshold > 0 else None
+        if reference is not None and np.abs(signature - reference).max() <= threshold:
+            groups[-1].append(name)
+            continue
+        reference = signature
+        groups.append([])
+        yield name, rgb
+
+
+def _analyze_deduplicated(frames, params: dict, workers: int = 1, cache: FrameCache | None = None, threshold: float = 0,
+                          stats: dict | None = None):
+    """
+    Yield (name, features, reused) for every frame, in frame order.
+
+    With a threshold, near-duplicates of the previous analyzed frame skip
+    Lab conversion and clustering and reuse its features.
+    """
+    groups = deque()
+    analyzed = _analyze_frames(_skip_duplicates(frames, threshold, groups), params, workers, cache, stats)
+
+    # A frame's duplicates are only all known once the next frame was read,
+    # so each result is held back until the next one arrives
+    held = None
+    try:
+        for name, features in analyzed:
+            if held is not None:
+                yield held[0], held[1], False
+                for duplicate in groups.popleft():
+                    yield duplicate, held[1], True
+            held = name, features
+        if held is not None:
+            yield held[0], held[1], False
+            for duplicate in groups.popleft():
+                yield duplicate, held[1], True
+    finally:
+        analyzed.close()
 
 
 def run_analysis(args) -> None:
     """
     Run frame-by-frame color analysis and save JSON output.
+
+    With --stream, frames are decoded by ffmpeg straight into memory
+    and the frames directory is not used.
     """
     frames_dir = Path(args.frames_dir)
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    params = _analysis_params(args)
 
-    frames = sorted(frames_dir.glob("*.png"))
-    if not frames:
-        console.print(f"[red]✖ No frames found in {frames_dir}. Run extract first.[/red]")
-        raise SystemExit(1)
+    if args.stream:
+        # Fail cleanly before the decode cache fingerprints the file
+        if not Path(args.video).is_file():
+            console.print(f"[red]✖ Could not read {args.video}: no such file[/red]")
+            raise SystemExit(1)
+        total = None
+        if args.shots is not None:
+            source = f"ffmpeg stream (one per shot, scene > {args.shots})"
+        elif args.interval is not None:
+            snapped = ", snapped to keyframes" if args.snap_keyframes else ""
+            source = f"ffmpeg seeks (one every {args.interval:g}s{snapped})"
+        elif args.keyframes:
+            source = "ffmpeg stream (keyframes)"
+        else:
+            source = f"ffmpeg stream (every {args.every_n or 24})"
+    else:
+        total = len(_frame_paths(frames_dir))
+        source = total
+        if not total:
+            console.print(f"[red]✖ No frames found in {frames_dir}. Run extract first.[/red]")
+            raise SystemExit(1)
+        _check_frames_dir(args)
 
     # Get FPS for accurate timestamps
     fps = _get_fps(args.video)
+    box = extract.crop_box(params["crop"])
+    crop = extract.describe_crop(box) if box else params["crop"]
 
     console.print(
         "[bold cyan]▶ Analyzing frames[/bold cyan]\n"
-        f"  Frames : {len(frames)}\n"
-        f"  Clusters: {args.k}\n"
-        f"  FPS    : {fps:.2f}"
+        f"  Frames : {source}\n"
+        f"  Clusters: {args.k} ({args.cluster_backend}"
+        f"{f', {args.hist_bins}³ histogram' if args.hist_bins else ''})\n"
+        f"  Crop   : {crop}\n"
+        f"  Size   : {params['size'][0]}x{params['size'][1]}\n"
+        f"  FPS    : {fps:.2f}\n"
+        f"  Workers: {args.workers}"
     )
 
-    data = []
-    all_lab_pixels = []  # Collect all pixels for movie-level palettes
+    # Frames are written as they finish; only the pixel sample stays in memory
+    writer = ResultWriter(out_path, output_format(out_path, args.format))
+    # Fixed-size sample of pixels for movie-level palettes
+    sampler = ReservoirSampler(args.palette_sample_size, seed=args.seed)
+
+    cache = None
+    if not args.no_frame_cache:
+        cache = FrameCache(args.frame_cache or str(out_path.with_suffix(".cache.sqlite")), params)
 
     with progress_bar() as progress:
-        task = progress.add_task("Processing frames", total=len(frames))
+        task = progress.add_task("Processing frames", total=total)
 
-        for i, frame in enumerate(frames):
-            rgb = _load_frame(frame)
-            
-            # Remove letterbox bars
-            rgb = _remove_letterbox(rgb)
-            
-            # Convert to Lab and filter
-            pixels = rgb.reshape(-1, 3)
-            lab = rgb2lab(pixels.reshape(1, -1, 3)).reshape(-1, 3)
-            lab = _filter_luminance(lab)
-            
-            # Collect for movie palettes
-            all_lab_pixels.append(lab)
+        decode_cache = None
+        if args.stream and not args.no_decode_cache:
+            decode_cache = DecodeCache(args.decode_cache_size)
+
+        # Shot or sample records, filled in as frames are decoded
+        spans = []
+        # Analysis time of analyzed frames, to estimate what dedupe saved
+        stats = {"frames": 0, "seconds": 0.0}
+        frames = _analyze_deduplicated(
+            _iter_frames(args, decode_cache, spans), params, args.workers, cache, args.dedupe_threshold, stats,
+        )
+        reused = 0
+        try:
+            for i, (name, features, duplicate) in enumerate(frames):
+                span = spans[i] if i < len(spans) else None
 
-            entry = {
-                "frame": frame.name,
-                "time": i / fps,  # Correct timestamp based on FPS
-                "dominant_lab": _dominant_colors(rgb, args.k)[0],
-                "palette_lab": _dominant_colors(rgb, args.k),
-                "mean_lab": _mean_color(rgb),
-            }
+                # Collect for movie palettes; a span counts once per frame it lasts
+                sampler.add(features["pixels"], weight=span["frames"] if span else 1.0)
 
-            data.append(entry)
-            progress.advance(task)
+                entry = {
+                    "frame": name,
+                    "time": span["start"] if span else i / fps,  # Correct timestamp based on FPS
+                    "dominant_lab": features["dominant_lab"],
+                    "palette_lab": features["palette_lab"],
+                    "palette_weights": features["palette_weights"],
+                    "mean_lab": features["mean_lab"],
+                }
+                if span:
+                    entry["duration"] = span["end"] - span["start"]
+                    entry["frames"] = span["frames"]
+                if duplicate:
+                    entry["reused"] = True
+                    reused += 1
+
+                with profiling.span("write"):
+                    writer.write_frame(entry)
+                progress.advance(task)
+        except BaseException:
+            writer.discard()
+            raise
+        finally:
+            frames.close()
+            if cache is not None:
+                cache.close()
+
+    if cache is not None:
+        console.print(f"  Cached : {cache.hits} frames reused, {cache.misses} analyzed")
+    if spans:
+        label = _span_key(args)
+        console.print(f"  {label.capitalize():<7}: {len(spans)} {label} covering {sum(span['frames'] for span in spans)} frames")
+    if reused:
+        # Skipped frames would have cost about as much to analyze as analyzed
+        # ones; decoding, pool startup and writing are paid for them anyway.
+        # Workers analyze side by side, so their time counts once per worker.
+        saved = stats["seconds"] / max(stats["frames"], 1) * reused / max(args.workers, 1)
+        console.print(f"  Dedupe : {reused} near-duplicate frames reused, ~{saved:.1f}s saved")
+
+    if not writer.count:
+        writer.discard()
+        console.print("[red]✖ No frames decoded from the stream.[/red]")
+        raise SystemExit(1)
 
     # Compute movie-level palettes
     console.print("\n[bold cyan]▶ Computing movie-level palettes[/bold cyan]")
-    all_lab_pixels = np.vstack(all_lab_pixels)
+    console.print(f"  Pixels : {len(sampler.sample())} sampled of {sampler.seen}")
     
-    # Subsample if too many pixels (for performance)
-    if len(all_lab_pixels) > 100000:
-        indices = np.random.choice(len(all_lab_pixels), 100000, replace=False)
-        all_lab_pixels = all_lab_pixels[indices]
-    
-    palettes = _compute_movie_palettes(all_lab_pixels, k=args.k)
-    
-    # Save results with palettes
-    output = {
-        "frames": data,
-        "palettes": palettes
-    }
+    # Pixels of shots and interval samples count as many times as their span has frames
+    weights = sampler.weights() if _span_key(args) else None
+    with profiling.span("movie_palettes", 0):
+        palettes = _compute_movie_palettes(sampler.sample(), k=args.k, overall=args.overall_palette,
+                                           weights=weights)
 
-    with open(out_path, "w") as f:
-        json.dump(output, f, indent=2)
+    # Close the output with the palettes
+    writer.finish(palettes)
 
     console.print(f"[green]✔ Analysis written to {out_path}[/green]")
@@ -0,0 +1,246 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from cinechroma import analyze, render
+from cinechroma.ui import console, progress_bar
+from cinechroma.utils import video_fingerprint
+
+
+# File extensions picked up when scanning a library
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".m4v", ".webm")
+
+# Summary of a batch run, written to the output directory
+MANIFEST_NAME = "manifest.json"
+
+# Batch options that only affect scheduling and caching, not the outputs of a film
+_SCHEDULING_OPTIONS = {
+    "command", "dir", "out_dir", "workers", "decode_jobs", "force", "quiet", "no_color", "version",
+    "decode_cache_size", "no_decode_cache", "no_frame_cache",
+}
+
+
+def discover_videos(root: Path) -> list[Path]:
+    """
+    All video files below root, in a stable order.
+    """
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS)
+
+
+def _film_names(root: Path, videos: list[Path]) -> dict[Path, str]:
+    """
+    Output directory and manifest key of every video: its path below root
+    without the extension, keeping the extension where videos such as
+    movie.mp4 and movie.mkv would otherwise share one.
+    """
+    stems = Counter(video.relative_to(root).with_suffix("") for video in videos)
+    return {
+        video: (relative if stems[relative.with_suffix("")] > 1 else relative.with_suffix("")).as_posix()
+        for video, relative in ((video, video.relative_to(root)) for video in videos)
+    }
+
+
+def _settings(args) -> dict:
+    """
+    Options that determine a film's outputs, in JSON form.
+    """
+    settings = {key: value for key, value in vars(args).items() if key not in _SCHEDULING_OPTIONS}
+    return json.loads(json.dumps(settings))
+
+
+def _film_args(args, video: Path, out: Path) -> argparse.Namespace:
+    """
+    analyze arguments for one film of the batch.
+    """
+    film = argparse.Namespace(**vars(args))
+    film.video = str(video)
+    film.out = str(out / "analysis.json")
+    film.frames_dir = str(out / "frames")
+    film.stream = True
+    film.workers = 1
+    film.frame_cache = None
+    return film
+
+
+def _read_manifest(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    """
+    Replace the manifest atomically, so an interrupted batch keeps it valid.
+    """
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _up_to_date(record: dict | None, fingerprint: str, settings: dict) -> bool:
+    """
+    A film is skipped when its last run succeeded on the same file with
+    the same settings and its outputs are still there.
+    """
+    return bool(
+        record
+        and record.get("status") == "done"
+        and record.get("fingerprint") == fingerprint
+        and record.get("settings") == settings
+        and all(Path(p).exists() for p in record.get("outputs", {}).values())
+    )
+
+
+def _init_analyzer() -> None:
+    """
+    Analysis processes run quietly and single-threaded.
+    """
+    console.quiet = True
+    analyze._init_worker()
+
+
+def _analyze_film(film: argparse.Namespace, outputs: dict) -> float:
+    """
+    Worker entry point: analyze one film and render its strip and palette.
+    Returns the elapsed time.
+    """
+    started = time.perf_counter()
+    try:
+        analyze.run_analysis(film)
+        render.render_color_strip(film.out, height=film.height, out_path=outputs["strip"],
+                                  width=film.width, strip=film.strip)
+        render.render_palette_bars(film.out, out_path=outputs["palette"])
+    except SystemExit:
+        # The failure was already reported; surface it as an ordinary error
+        raise RuntimeError(f"analysis of {film.video} failed") from None
+    return time.perf_counter() - started
+
+
+def run_batch(args) -> None:
+    """
+    Analyze every video below a directory.
+
+    Decoding and analysis are separate stages with their own limits:
+    --decode-jobs ffmpeg decodes fill the decode cache, and --workers
+    processes analyze and render films as their frames become available.
+    Films whose outputs are up to date are skipped. A manifest of every
+    film's status, outputs and timing is kept in the output directory.
+    """
+    root = Path(args.dir)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+
+    videos = discover_videos(root)
+    if not videos:
+        console.print(f"[red]✖ No videos found in {root}[/red]")
+        raise SystemExit(1)
+
+    settings = _settings(args)
+    previous = {} if args.force else _read_manifest(manifest_path).get("films", {})
+    films = {}
+    todo = []
+
+    for video, name in _film_names(root, videos).items():
+        out = out_dir / name
+        fingerprint = video_fingerprint(video)
+        if _up_to_date(previous.get(name), fingerprint, settings):
+            films[name] = dict(previous[name], status="done", skipped=True)
+            continue
+        outputs = {
+            "analysis": str(out / "analysis.json"),
+            "strip": str(out / "strip.png"),
+            "palette": str(out / "palette.png"),
+        }
+        films[name] = {
+            "video": str(video), "fingerprint": fingerprint, "settings": settings,
+            "outputs": outputs, "status": "pending",
+        }
+        todo.append((name, out))
+
+    console.print(
+        "[bold cyan]▶ Batch analysis[/bold cyan]\n"
+        f"  Library: {root} ({len(videos)} videos, {len(videos) - len(todo)} up to date)\n"
+        f"  Output : {out_dir}\n"
+        f"  Decode : {0 if args.no_decode_cache else args.decode_jobs} jobs\n"
+        f"  Workers: {args.workers}"
+    )
+
+    manifest = {"root": str(root), "films": films}
+    _write_manifest(manifest_path, manifest)
+
+    def finish(name, status, **fields):
+        films[name].update(status=status, **fields)
+        _write_manifest(manifest_path, manifest)
+        progress.advance(task)
+        if status == "failed":
+            progress.console.print(f"[red]✖ {name}: {fields.get('error')}[/red]")
+
+    queue = list(reversed(todo))
+    decoding, analyzing = {}, {}
+    # Films decoded ahead of analysis, bounded so the decode cache holds them
+    ahead = args.decode_jobs + 2 * args.workers
+
+    with progress_bar() as progress, \
+            ThreadPoolExecutor(max_workers=args.decode_jobs) as decoders, \
+            analyze.process_pool(args.workers, _init_analyzer) as analyzers:
+        task = progress.add_task("Analyzing films", total=len(todo))
+
+        def start_analysis(name, out):
+            out.mkdir(parents=True, exist_ok=True)
+            film = _film_args(args, Path(films[name]["video"]), out)
+            analyzing[analyzers.submit(_analyze_film, film, films[name]["outputs"])] = name
+
+        while queue or decoding or analyzing:
+            while queue and len(decoding) < args.decode_jobs and len(decoding) + len(analyzing) < ahead:
+                name, out = queue.pop()
+                if args.no_decode_cache:
+                    start_analysis(name, out)
+                    continue
+                film = _film_args(args, Path(films[name]["video"]), out)
+                decoding[decoders.submit(analyze.predecode, film)] = (name, out, time.perf_counter())
+
+            done, _ = wait(list(decoding) + list(analyzing), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in decoding:
+                    name, out, started = decoding.pop(future)
+                    try:
+                        future.result()
+                    except (Exception, SystemExit) as e:
+                        finish(name, "failed", error="decoding failed" if isinstance(e, SystemExit) else str(e))
+                        continue
+                    films[name]["decode_seconds"] = round(time.perf_counter() - started, 3)
+                    start_analysis(name, out)
+                else:
+                    name = analyzing.pop(future)
+                    try:
+                        elapsed = future.result()
+                    except Exception as e:
+                        finish(name, "failed", error=str(e))
+                        continue
+                    finish(name, "done", analyze_seconds=round(elapsed, 3))
+
+    failed = [name for name, film in films.items() if film["status"] == "failed"]
+    console.print(
+        f"  Done   : {len(todo) - len(failed)} analyzed, {len(videos) - len(todo)} skipped, {len(failed)} failed\n"
+        f"  Summary: {manifest_path}"
+    )
+    if failed:
+        raise SystemExit(1)
+    console.print("[green]✔ Batch complete[/green]")
@@ -0,0 +1,178 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from cinechroma.utils import cache_dir
+
+
+# Bumped whenever the layout of cached palettes changes
+FRAME_CACHE_VERSION = 2
+
+
+def frame_key(rgb: np.ndarray) -> str:
+    """
+    Content hash of a frame as it is analyzed.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(rgb).tobytes(), digest_size=16).hexdigest()
+
+
+class FrameCache:
+    """
+    On-disk cache of per-frame palettes, stored in SQLite.
+
+    Entries are keyed by frame content and by every analysis parameter, so
+    a changed frame or setting is a miss rather than a stale hit. Writes are
+    committed every checkpoint_every frames, and a killed run loses at most
+    that many frames of work.
+    """
+
+    def __init__(self, path: str, params: dict, checkpoint_every: int = 64):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS frames (key TEXT PRIMARY KEY, palette TEXT NOT NULL)")
+        scope = dict(params, version=FRAME_CACHE_VERSION)
+        self._scope = hashlib.sha1(json.dumps(scope, sort_keys=True).encode()).hexdigest()
+        self._checkpoint_every = checkpoint_every
+        self._uncommitted = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, frame: str) -> str:
+        return f"{self._scope}:{frame}"
+
+    def get(self, frame: str) -> list | None:
+        """
+        Cached (centers, shares) palette of a frame, or None.
+        """
+        row = self._db.execute("SELECT palette FROM frames WHERE key = ?", (self._key(frame),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, frame: str, palette: tuple[list, list]) -> None:
+        """
+        Store the palette of a frame, checkpointing periodically.
+        """
+        self._db.execute(
+            "INSERT OR REPLACE INTO frames (key, palette) VALUES (?, ?)",
+            (self._key(frame), json.dumps(palette)),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self._checkpoint_every:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+
+class DecodeCache:
+    """
+    Content-addressed store of decoded, downscaled frames.
+
+    Each entry holds every sampled frame of one video as a raw uint8
+    (count, height, width, 3) array next to a meta.json. Entries are keyed
+    by video fingerprint, sampling mode and frame size, so frames of a
+    different or modified video can never be returned. The store is capped
+    at max_bytes and evicts least recently used entries.
+    """
+
+    def __init__(self, max_bytes: int, root: Path | None = None):
+        self.root = Path(root) if root else cache_dir() / "frames"
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(fingerprint: str, mode: str, size: tuple[int, int], interp: str) -> str:
+        text = f"{fingerprint}:{mode}:{size[0]}x{size[1]}:{interp}"
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[np.ndarray, dict] | None:
+        """
+        Memory-map the frames of an entry and load its metadata,
+        or None if it is not cached.
+        """
+        entry = self.root / key
+        try:
+            with open(entry / "meta.json") as f:
+                meta = json.load(f)
+            frames = np.memmap(entry / "frames.u8", dtype=np.uint8, mode="r", shape=tuple(meta["shape"]))
+        except (OSError, ValueError, KeyError, json.JSONDecodeError):
+            return None
+
+        # The meta file's mtime is the entry's last use
+        os.utime(entry / "meta.json")
+        return frames, meta
+
+    def store(self, key: str, frames, meta: dict):
+        """
+        Yield frames while writing them to a new entry.
+
+        The entry only becomes visible once every frame was written; an
+        interrupted run leaves nothing behind. meta is saved at that point,
+        so it may be filled in while the frames are consumed.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{key}.tmp-{os.getpid()}"
+        tmp.mkdir(exist_ok=True)
+        count, shape = 0, None
+
+        try:
+            with open(tmp / "frames.u8", "wb") as f:
+                for frame in frames:
+                    shape = frame.shape
+                    f.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+                    count += 1
+                    yield frame
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        if count == 0:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        with open(tmp / "meta.json", "w") as f:
+            json.dump(dict(meta, shape=[count, *shape]), f, indent=2)
+
+        final = self.root / key
+        shutil.rmtree(final, ignore_errors=True)
+        tmp.rename(final)
+        self.evict(keep=key)
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Delete least recently used entries until the store fits max_bytes.
+        """
+        entries = []
+        for entry in self.root.iterdir():
+            meta = entry / "meta.json"
+            if not meta.exists():
+                continue
+            size = sum(p.stat().st_size for p in entry.iterdir())
+            entries.append((meta.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
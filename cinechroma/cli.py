@@ -9,13 +9,68 @@ See README.md for:
 """
 
 import argparse
+import os
 import sys
 import shutil
 from pathlib import Path
 
+from cinechroma.options import INTERPOLATIONS, SHOT_THRESHOLD, STRIP_TYPES
+from cinechroma.results import FORMATS
 from cinechroma.ui import show_banner, console
-from cinechroma.utils import check_ffmpeg
-from cinechroma import extract, analyze, render
+from cinechroma.utils import (
+    check_ffmpeg, parse_bytes, parse_crop, parse_non_negative_int, parse_positive_float, parse_positive_int,
+    parse_size,
+)
+
+# Command modules (and cv2, scikit-learn, NumPy behind them) are imported
+# in dispatch, only for the command that runs, so light commands such as
+# info, clean and --version start quickly.
+
+
+def add_analysis_options(p: argparse.ArgumentParser) -> None:
+    """
+    Sampling and analysis options shared by analyze and batch.
+    """
+    p.add_argument("--every-n", type=int)
+    p.add_argument("--keyframes", action="store_true")
+    p.add_argument("--shots", type=float, nargs="?", const=SHOT_THRESHOLD, metavar="THRESHOLD",
+                   help="With --stream, analyze one frame per shot weighted by shot length")
+    p.add_argument("--interval", type=parse_positive_float, metavar="SECONDS",
+                   help="With --stream, seek to one frame every SECONDS instead of decoding the whole video")
+    p.add_argument("--snap-keyframes", action="store_true",
+                   help="With --interval, take the first keyframe of each interval (faster, less regular)")
+    p.add_argument("--k", type=int, default=5)
+    p.add_argument("--format", choices=FORMATS,
+                   help="Output format (default: ndjson for .ndjson/.jsonl, else json)")
+    p.add_argument("--interp", choices=INTERPOLATIONS, help="Downscale inside ffmpeg when streaming")
+    p.add_argument("--crop", type=parse_crop, default="frame", metavar="MODE",
+                   help="Black bars: frame removes letterbox bars per frame during analysis (default), "
+                        "auto detects the matte once and crops it while decoding with --stream, "
+                        "W:H:X:Y crops that box, none keeps whole frames")
+    p.add_argument("--cluster-backend", choices=["sklearn", "batched"], default="sklearn",
+                   help="Per-frame KMeans, or batched NumPy k-means over many frames at once")
+    p.add_argument("--hist-bins", type=parse_non_negative_int, default=0,
+                   help="Cluster a weighted Lab histogram with this many bins per axis instead of raw pixels")
+    p.add_argument("--size", type=parse_size, help="Analysis resolution WxH (default: 64x64)")
+    p.add_argument("--palette-sample-size", type=parse_positive_int, default=100000,
+                   help="Pixels kept for movie-level palettes (fixed memory)")
+    p.add_argument("--seed", type=int, default=0, help="Seed for palette pixel sampling")
+    p.add_argument("--overall-palette", choices=["refit", "seeded", "hierarchical"], default="refit",
+                   help="Recluster all pixels, start from the band centroids, or cluster the band centroids")
+    p.add_argument("--no-frame-cache", action="store_true", help="Analyze every frame from scratch")
+    p.add_argument("--dedupe-threshold", type=float, default=0,
+                   help="Reuse the previous frame's results when no cell of an 8x8 thumbnail differs "
+                        "by more than this many 8-bit levels (default: 0, off)")
+    p.add_argument("--decode-cache-size", type=parse_bytes, default="10G",
+                   help="Size cap of the shared decoded-frame cache, e.g. 500M or 10G")
+    p.add_argument("--no-decode-cache", action="store_true", help="Always decode the video with --stream")
+
+
+def add_profile_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--profile", action="store_true",
+                   help="Time every stage and print total, mean and p95 per frame")
+    p.add_argument("--trace", type=str, metavar="PATH",
+                   help="Also write a Chrome trace-event JSON timeline (implies --profile)")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -34,15 +89,43 @@ def build_parser() -> argparse.ArgumentParser:
     extract_p.add_argument("video")
     extract_p.add_argument("--every-n", type=int)
     extract_p.add_argument("--keyframes", action="store_true")
+    extract_p.add_argument("--shots", type=float, nargs="?", const=SHOT_THRESHOLD, metavar="THRESHOLD",
+                           help=f"One frame per shot, cut where the scene score exceeds THRESHOLD (default {SHOT_THRESHOLD})")
+    extract_p.add_argument("--interval", type=parse_positive_float, metavar="SECONDS",
+                           help="One frame every SECONDS, seeking to each instead of decoding the whole video")
+    extract_p.add_argument("--snap-keyframes", action="store_true",
+                           help="With --interval, take the first keyframe of each interval (faster, less regular)")
     extract_p.add_argument("--frames-dir", type=str, default="frames")
+    extract_p.add_argument("--size", type=parse_size, help="Downscale frames to WxH while decoding")
+    extract_p.add_argument("--interp", choices=INTERPOLATIONS, default="area")
+    extract_p.add_argument("--crop", type=parse_crop, default="frame", metavar="MODE",
+                           help="Black bars: auto detects the matte once and crops it away while decoding, "
+                                "W:H:X:Y crops that box; frame (default) and none keep whole frames")
+    extract_p.add_argument("--segments", type=parse_positive_int, default=1,
+                           help="Decode N time ranges with N parallel ffmpeg processes (default: 1)")
+    add_profile_options(extract_p)
 
     analyze_p = sub.add_parser("analyze")
     analyze_p.add_argument("video")
-    analyze_p.add_argument("--every-n", type=int)
-    analyze_p.add_argument("--keyframes", action="store_true")
-    analyze_p.add_argument("--k", type=int, default=5)
     analyze_p.add_argument("--frames-dir", type=str, default="frames")
     analyze_p.add_argument("--out", type=str, default="output/analysis.json")
+    analyze_p.add_argument("--stream", action="store_true", help="Decode frames in memory instead of reading --frames-dir")
+    analyze_p.add_argument("--workers", type=int, default=1, help="Worker processes for frame analysis")
+    analyze_p.add_argument("--frame-cache", type=str, help="Per-frame result cache (default: next to --out)")
+    add_profile_options(analyze_p)
+    add_analysis_options(analyze_p)
+
+    batch_p = sub.add_parser("batch", help="Analyze every video in a directory")
+    batch_p.add_argument("dir")
+    batch_p.add_argument("--out-dir", type=str, default="output", help="One subdirectory of outputs per film")
+    batch_p.add_argument("--workers", type=parse_positive_int, default=os.cpu_count() or 1,
+                         help="Films analyzed in parallel, one process each (default: CPU count)")
+    batch_p.add_argument("--decode-jobs", type=parse_positive_int, default=2, help="Concurrent ffmpeg decodes (default: 2)")
+    batch_p.add_argument("--force", action="store_true", help="Reprocess films whose outputs are up to date")
+    batch_p.add_argument("--height", type=int, default=400, help="Strip height in pixels")
+    batch_p.add_argument("--width", type=parse_positive_int, help="Strip width in pixels")
+    batch_p.add_argument("--strip", choices=STRIP_TYPES, default="dominant")
+    add_analysis_options(batch_p)
 
     info_p = sub.add_parser("info")
     info_p.add_argument("video")
@@ -51,6 +134,9 @@ def build_parser() -> argparse.ArgumentParser:
     render_p.add_argument("type", choices=["strip", "palette"])
     render_p.add_argument("input")
     render_p.add_argument("--height", type=int, default=400)
+    render_p.add_argument("--width", type=parse_positive_int, help="Strip width in pixels; frames are averaged into time bins")
+    render_p.add_argument("--strip", choices=STRIP_TYPES, default="dominant",
+                          help="Strip colors: dominant, mean, or stacked palette proportions")
     render_p.add_argument("--out", type=str)
 
     clean_p = sub.add_parser("clean", help="Remove generated frames and output files")
@@ -66,25 +152,49 @@ def dispatch(args) -> int:
         console.print("cinechroma v0.1.0")
         return 0
 
-    if args.command in ("extract", "analyze"):
+    if args.command in ("extract", "analyze", "batch"):
         check_ffmpeg()
 
+    profile = getattr(args, "profile", False) or getattr(args, "trace", None)
+    if profile:
+        from cinechroma import profiling
+        profiling.enable()
+
     if args.command == "extract":
-        if args.keyframes:
-            extract.extract_keyframes(args.video, args.frames_dir)
+        if args.segments > 1 and (args.shots is not None or args.interval is not None):
+            console.print("[red]✖ --segments only applies to every-N and keyframe extraction[/red]")
+            raise SystemExit(1)
+        from cinechroma import extract
+        if args.shots is not None:
+            extract.extract_shots(args.video, args.frames_dir, args.shots, args.size, args.interp, args.crop)
+        elif args.interval is not None:
+            extract.extract_interval(args.video, args.frames_dir, args.interval, args.size, args.interp,
+                                     args.snap_keyframes, args.crop)
+        elif args.keyframes:
+            extract.extract_keyframes(args.video, args.frames_dir, args.size, args.interp, args.segments,
+                                      args.crop)
         else:
-            extract.extract_every_n(args.video, args.frames_dir, args.every_n or 24)
+            extract.extract_every_n(args.video, args.frames_dir, args.every_n or 24, args.size, args.interp,
+                                    args.segments, args.crop)
 
     elif args.command == "analyze":
+        from cinechroma import analyze
         analyze.run_analysis(args)
 
+    elif args.command == "batch":
+        from cinechroma import batch
+        batch.run_batch(args)
+
     elif args.command == "info":
-        analyze.get_video_info(args.video)
+        from cinechroma import probe
+        probe.get_video_info(args.video)
 
     elif args.command == "render":
+        from cinechroma import render
         out_path = args.out if hasattr(args, 'out') and args.out else None
         if args.type == "strip":
-            render.render_color_strip(args.input, height=args.height, out_path=out_path)
+            render.render_color_strip(args.input, height=args.height, out_path=out_path,
+                                      width=args.width, strip=args.strip)
         elif args.type == "palette":
             render.render_palette_bars(args.input, out_path=out_path)
 
@@ -139,6 +249,9 @@ def dispatch(args) -> int:
         console.print("[red]✖ No command specified[/red]")
         return 1
 
+    if profile:
+        profiling.report(args.trace)
+
     return 0
 
 
@@ -0,0 +1,126 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+from functools import lru_cache
+
+import numpy as np
+
+from cinechroma.utils import cache_dir
+
+
+# Bits per channel of the sRGB→Lab cube: 128³ cells, 24 MiB in float32.
+# Max ΔE against skimage's rgb2lab is below 1 (8 bits makes it exact).
+LUT_BITS = 7
+
+# sRGB (D65) to XYZ, the same matrix skimage uses
+_XYZ_FROM_RGB = np.array([
+    [0.412453, 0.357580, 0.180423],
+    [0.212671, 0.715160, 0.072169],
+    [0.019334, 0.119193, 0.950227],
+])
+_RGB_FROM_XYZ = np.linalg.inv(_XYZ_FROM_RGB).astype(np.float32)
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+
+def _build_lut(bits: int) -> np.ndarray:
+    """
+    Evaluate skimage's rgb2lab at the centre of every cube cell.
+    """
+    # Only needed when the table is not cached yet; skimage pulls in scipy
+    from skimage.color import rgb2lab
+
+    levels = 1 << bits
+    step = 256 // levels
+    codes = (np.arange(levels) * step + (step - 1) / 2) / 255.0
+    grid = np.stack(np.meshgrid(codes, codes, codes, indexing="ij"), axis=-1)
+    return rgb2lab(grid.reshape(1, -1, 3)).reshape(-1, 3).astype(np.float32)
+
+
+@lru_cache(maxsize=None)
+def lab_lut(bits: int = LUT_BITS, persist: bool = True) -> np.ndarray:
+    """
+    sRGB→Lab lookup table, built once per process.
+
+    The table is a flattened (2**bits)³ x 3 float32 cube indexed by the top
+    bits of each 8-bit channel. With persist, it is stored in the cache
+    directory so later processes only load it.
+    """
+    path = cache_dir() / f"srgb_lab_{bits}.npy"
+    shape = ((1 << bits) ** 3, 3)
+
+    if persist and path.exists():
+        try:
+            lut = np.load(path)
+            if lut.shape == shape and lut.dtype == np.float32:
+                return lut
+        except (OSError, ValueError):
+            pass
+
+    lut = _build_lut(bits)
+
+    if persist:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp.npy")
+            np.save(tmp, lut)
+            tmp.replace(path)
+        except OSError:
+            # A read-only cache only costs a rebuild next time
+            pass
+
+    return lut
+
+
+def rgb_to_lab(rgb: np.ndarray, bits: int = LUT_BITS) -> np.ndarray:
+    """
+    Convert sRGB pixels to Lab through the lookup table.
+
+    Accepts uint8 values or floats in [0, 1] that came from 8-bit data,
+    with channels on the last axis. Returns float32 Lab of the same shape.
+    """
+    if rgb.dtype != np.uint8:
+        rgb = np.rint(np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8)
+
+    shift = 8 - bits
+    codes = rgb.reshape(-1, 3) >> shift
+    index = (codes[:, 0].astype(np.intp) << (2 * bits)) | (codes[:, 1].astype(np.intp) << bits) | codes[:, 2]
+
+    return np.take(lab_lut(bits), index, axis=0).reshape(rgb.shape)
+
+
+@lru_cache(maxsize=None)
+def _srgb_thresholds() -> np.ndarray:
+    """
+    Linear-light value at which each 8-bit sRGB code 1..255 starts.
+    """
+    c = np.arange(1, 256) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear.astype(np.float32)
+
+
+def lab_to_rgb8(lab) -> np.ndarray:
+    """
+    Convert Lab colors to 8-bit sRGB, computing in float32.
+
+    Lab→XYZ→linear RGB is evaluated directly; the sRGB transfer curve is a
+    lookup into the 255 code thresholds. Matches
+    (clip(lab2rgb(lab), 0, 1) * 255).astype(uint8) up to float32 rounding
+    at code boundaries. Channels are on the last axis.
+    """
+    lab = np.asarray(lab, dtype=np.float32)
+
+    fy = (lab[..., 0] + 16.0) / 116.0
+    fx = fy + lab[..., 1] / 500.0
+    fz = np.maximum(fy - lab[..., 2] / 200.0, 0.0)
+    f = np.stack([fx, fy, fz], axis=-1)
+
+    xyz = np.where(f > 0.2068966, f ** 3, (f - 16.0 / 116.0) / 7.787) * _WHITE_D65
+    linear = xyz @ _RGB_FROM_XYZ.T
+
+    return np.searchsorted(_srgb_thresholds(), linear, side="right").astype(np.uint8)
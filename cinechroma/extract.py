@@ -7,63 +7,842 @@ See README.md for:
 """
 
 
+import json
+import os
+import queue
+import re
+import shutil
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from cinechroma import profiling
+from cinechroma.options import SHOT_THRESHOLD
+from cinechroma.probe import ProbeError, VideoInfo, probe
 from cinechroma.ui import console
+from cinechroma.utils import video_fingerprint
+
+
+# Frame metadata written next to extracted frames
+MANIFEST_NAME = "extract.json"
+
+# pts_time of a frame reported by the showinfo filter
+_SHOWINFO_TIME = re.compile(r"\[Parsed_showinfo.*\] n:\s*\d+ pts:\s*\S+\s+pts_time:(\S+)")
+
+# Times spread over the video at which cropdetect looks for a matte
+CROP_SAMPLES = 10
+
+# Frames cropdetect reads at each of those times
+CROP_FRAMES = 4
+
+# Crop box suggested by the cropdetect filter
+_CROPDETECT = re.compile(r"crop=(-?\d+):(-?\d+):(-?\d+):(-?\d+)")
+
+
+def _scale_filter(size: tuple[int, int] | None, interp: str) -> list[str]:
+    """
+    Build the ffmpeg scale filter for decode-time downscaling.
+    Returns an empty list when frames are kept at native resolution.
+    """
+    if size is None:
+        return []
+    return [f"scale={size[0]}:{size[1]}:flags={interp}"]
+
+
+def _shot_filters(threshold: float) -> list[str]:
+    """
+    Select the first frame of the video and of every detected shot,
+    logging each selected frame's timestamp with showinfo.
+    """
+    return [f"select=eq(n\\,0)+gt(scene\\,{threshold})", "showinfo"]
+
+
+def _crop_filter(crop: tuple[int, int, int, int] | None) -> list[str]:
+    """
+    Build the ffmpeg crop filter for a (w, h, x, y) box.
+    Returns an empty list when frames are not cropped.
+    """
+    if crop is None:
+        return []
+    return ["crop={}:{}:{}:{}".format(*crop)]
+
+
+def describe_crop(crop: tuple[int, int, int, int] | None) -> str:
+    """
+    Crop box as WxH+X+Y, the way the CLI reports it.
+    """
+    return "{}x{}+{}+{}".format(*crop) if crop else "full frame"
+
+
+def _cropdetect_at(video: str, t: float) -> tuple[int, int, int, int] | None:
+    """
+    Bounds of the picture in the few frames t seconds into the video, as
+    found by ffmpeg's cropdetect. Like -ss, t counts from the video's start
+    time. Returns None when those frames are all black.
+    """
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "info", "-threads", "1",
+        "-ss", repr(t), "-i", video,
+        "-frames:v", str(CROP_FRAMES),
+        "-vf", "cropdetect=round=2:reset=0",
+        "-f", "null", "-",
+    ]
+    with profiling.span("cropdetect", 0):
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        console.print(result.stderr[-2000:], markup=False)
+        raise subprocess.CalledProcessError(result.returncode, cmd)
+
+    # With reset=0 the last box covers all frames read; black frames give w, h <= 0
+    boxes = [tuple(int(v) for v in m.groups()) for m in _CROPDETECT.finditer(result.stderr)]
+    boxes = [box for box in boxes if box[0] > 0 and box[1] > 0]
+    return boxes[-1] if boxes else None
+
+
+def detect_crop(video: str, samples: int = CROP_SAMPLES) -> tuple[int, int, int, int] | None:
+    """
+    Find the letterbox or pillarbox matte of a whole video.
+
+    cropdetect runs at `samples` times spread over the video, and the
+    union of the boxes it finds is the picture area, so a dark scene
+    cannot crop into the picture of a bright one. Returns (w, h, x, y)
+    rounded out to even pixels, or None when there are no black bars.
+    """
+    info = _probe(video)
+    width, height = info.size
+    duration = info.duration or 0.0
+    # Midpoints of equal slices skip the fades at the very start and end
+    targets = [duration * (i + 0.5) / samples for i in range(samples)]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        boxes = [box for box in pool.map(lambda t: _cropdetect_at(video, t), targets) if box]
+    if not boxes:
+        return None
+
+    x1 = max(0, min(x for _, _, x, _ in boxes)) // 2 * 2
+    y1 = max(0, min(y for _, _, _, y in boxes)) // 2 * 2
+    x2 = min(width, -(-max(x + w for w, _, x, _ in boxes) // 2) * 2)
+    y2 = min(height, -(-max(y + h for _, h, _, y in boxes) // 2) * 2)
+    if (x1, y1, x2, y2) == (0, 0, width, height):
+        return None
+    return x2 - x1, y2 - y1, x1, y1
 
 
-def extract_every_n(video: str, out_dir: str, n: int) -> None:
+def crop_box(crop: str) -> tuple[int, int, int, int] | None:
+    """
+    The (w, h, x, y) box of an explicit W:H:X:Y crop, else None.
+    """
+    if ":" not in crop:
+        return None
+    return tuple(int(v) for v in crop.split(":"))
+
+
+def resolve_crop(video: str, crop: str) -> tuple[int, int, int, int] | None:
+    """
+    Turn a --crop value into the (w, h, x, y) box cut out while decoding.
+    "frame" and "none" crop nothing at decode time; "auto" detects the
+    matte of the video.
+    """
+    if crop == "auto":
+        return detect_crop(video)
+    box = crop_box(crop)
+    if box is None:
+        return None
+
+    width, height = _probe(video).size
+    w, h, x, y = box
+    if x + w > width or y + h > height:
+        console.print(f"[red]✖ Crop {describe_crop(box)} does not fit in {width}x{height} frames[/red]")
+        raise SystemExit(1)
+    return box
+
+
+def _shots(starts: list[float], end: float, fps: float) -> list[dict]:
+    """
+    Turn shot start times into start/end/frames records.
+    Each shot ends where the next one starts, the last at the video's end.
+    """
+    ends = starts[1:] + [max(end, starts[-1])] if starts else []
+    return [
+        {"start": start, "end": end, "frames": max(1, round((end - start) * fps))}
+        for start, end in zip(starts, ends)
+    ]
+
+
+def _write_manifest(
+    out: Path,
+    video: str,
+    mode: str,
+    size: tuple[int, int] | None,
+    interp: str,
+    shots: list[dict] | None = None,
+    samples: list[dict] | None = None,
+    crop: str = "frame",
+    bounds: tuple[int, int, int, int] | None = None,
+) -> None:
+    """
+    Record how frames were extracted so analyze can trust their size
+    and crop, and, for shot or interval sampling, which span of the video
+    every frame stands for.
+    """
+    manifest = {
+        "video": str(video),
+        "fingerprint": video_fingerprint(video),
+        "mode": mode,
+        "size": list(size) if size else None,
+        "interp": interp if size else None,
+        "crop": crop,
+        "crop_bounds": list(bounds) if bounds else None,
+    }
+    if shots is not None:
+        manifest["shots"] = shots
+    if samples is not None:
+        manifest["samples"] = samples
+    with open(out / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def read_manifest(frames_dir: str) -> dict:
+    """
+    Load the extraction manifest of a frames directory.
+    Returns an empty dict for directories without one.
+    """
+    path = Path(frames_dir) / MANIFEST_NAME
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _count_frames(out: Path) -> int:
+    return sum(1 for _ in out.glob("*.png"))
+
+
+def _segment_bounds(info: VideoInfo, segments: int) -> list[tuple[float | None, float | None]]:
+    """
+    Split a video's duration into equal [start, end) time ranges.
+    The first range is open at the start and the last at the end, so
+    frames before or after the reported duration are not lost.
+    """
+    t0 = info.start_time or 0.0
+    cuts = [t0 + info.duration * i / segments for i in range(1, segments)]
+    return list(zip([None] + cuts, cuts + [None]))
+
+
+def _segment_select(start: float | None, end: float | None, n: int | None, info: VideoInfo) -> str:
+    """
+    select expression keeping the frames of one time range, and with n,
+    only every Nth frame counted from the start of the video.
+
+    With -copyts, t keeps the original timeline while each process seeks,
+    so the global frame index is recovered from t instead of n.
+    """
+    terms = []
+    if start is not None:
+        terms.append(f"gte(t\\,{start!r})")
+    if end is not None:
+        terms.append(f"lt(t\\,{end!r})")
+    if n is not None:
+        t0 = info.start_time or 0.0
+        terms.append(f"not(mod(round((t-{t0!r})*{info.fps!r})\\,{n}))")
+    return "select=" + ("*".join(terms) or "1")
+
+
+def _extract_segmented(
+    video: str,
+    out: Path,
+    segments: int,
+    n: int | None,
+    size: tuple[int, int] | None,
+    interp: str,
+    crop: tuple[int, int, int, int] | None = None,
+) -> None:
+    """
+    Decode a video with one ffmpeg process per time range, then number the
+    frames of all ranges in global order.
+
+    Each process seeks to its range with -ss and stops shortly after it
+    with -to, both relative to the video's start time as ffmpeg expects
+    them; the select filter cuts the ranges exactly, so frames at the
+    edges are neither duplicated nor dropped. n=None extracts keyframes.
+    """
+    info = _probe(video)
+    if info.duration is None or (n is not None and info.fps is None):
+        console.print("[red]✖ Could not determine duration and frame rate for segmented decode[/red]")
+        raise SystemExit(1)
+
+    t0 = info.start_time or 0.0
+    # Share the cores between the decoders instead of oversubscribing them
+    threads = max(1, (os.cpu_count() or 1) // segments)
+    # Read a little past each range end; select drops the overlap
+    margin = 1.0
+
+    procs, dirs = [], []
+    for i, (start, end) in enumerate(_segment_bounds(info, segments)):
+        seg_dir = out / f".segment-{i:03d}"
+        shutil.rmtree(seg_dir, ignore_errors=True)
+        seg_dir.mkdir()
+        dirs.append(seg_dir)
+
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-threads", str(threads)]
+        if n is None:
+            cmd += ["-skip_frame", "nokey"]
+        # Input -ss/-to count from the start of the video, while select
+        # sees the original timestamps kept by -copyts
+        if start is not None:
+            cmd += ["-ss", repr(start - t0)]
+        if end is not None:
+            cmd += ["-to", repr(end - t0 + margin)]
+        filters = [_segment_select(start, end, n, info)] + _crop_filter(crop) + _scale_filter(size, interp)
+        cmd += [
+            "-copyts",
+            "-i", video,
+            "-vf", ",".join(filters),
+            "-vsync", "vfr",
+            f"{seg_dir}/%06d.png",
+        ]
+        procs.append((subprocess.Popen(cmd), cmd))
+
+    try:
+        for proc, cmd in procs:
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+        # Renumber segment by segment into one global sequence
+        index = 1
+        for seg_dir in dirs:
+            for frame in sorted(seg_dir.glob("*.png")):
+                frame.rename(out / f"{index:06d}.png")
+                index += 1
+    finally:
+        for proc, _ in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        for seg_dir in dirs:
+            shutil.rmtree(seg_dir, ignore_errors=True)
+
+
+def extract_every_n(
+    video: str,
+    out_dir: str,
+    n: int,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    segments: int = 1,
+    crop: str = "frame",
+) -> None:
     """
     Extract every Nth frame from a video using ffmpeg.
+    If size is given, frames are downscaled inside ffmpeg's filter graph,
+    after black bars are cropped away as set by crop.
+    With segments > 1, that many ffmpeg processes decode time ranges of
+    the video in parallel.
     """
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
+    bounds = resolve_crop(video, crop)
 
     console.print(
         "[bold cyan]▶ Extracting frames[/bold cyan]\n"
         f"  Video : {video}\n"
-        f"  Mode  : every {n} frames\n"
+        f"  Mode  : every {n} frames{f' ({segments} segments)' if segments > 1 else ''}\n"
+        f"  Crop  : {describe_crop(bounds)}\n"
+        f"  Size  : {f'{size[0]}x{size[1]} ({interp})' if size else 'native'}\n"
         f"  Output: {out}"
     )
 
-    cmd = [
-        "ffmpeg",
-        "-hide_banner",
-        "-loglevel", "error",
-        "-i", video,
-        "-vf", f"select=not(mod(n\\,{n}))",
-        "-vsync", "vfr",
-        f"{out}/%06d.png",
-    ]
+    with profiling.span("ffmpeg") as timing:
+        if segments > 1:
+            _extract_segmented(video, out, segments, n, size, interp, bounds)
+        else:
+            filters = [f"select=not(mod(n\\,{n}))"] + _crop_filter(bounds) + _scale_filter(size, interp)
+
+            cmd = [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel", "error",
+                "-i", video,
+                "-vf", ",".join(filters),
+                "-vsync", "vfr",
+                f"{out}/%06d.png",
+            ]
 
-    subprocess.run(cmd, check=True)
+            subprocess.run(cmd, check=True)
+        timing.frames = _count_frames(out)
+    _write_manifest(out, video, f"every-{n}", size, interp, crop=crop, bounds=bounds)
 
     console.print("[green]✔ Frame extraction complete[/green]")
 
 
-def extract_keyframes(video: str, out_dir: str) -> None:
+def extract_keyframes(
+    video: str,
+    out_dir: str,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    segments: int = 1,
+    crop: str = "frame",
+) -> None:
     """
     Extract keyframes (I-frames only).
+    If size is given, frames are downscaled inside ffmpeg's filter graph,
+    after black bars are cropped away as set by crop.
+    With segments > 1, that many ffmpeg processes decode time ranges of
+    the video in parallel.
     """
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
+    bounds = resolve_crop(video, crop)
 
     console.print(
         "[bold cyan]▶ Extracting keyframes[/bold cyan]\n"
         f"  Video : {video}\n"
+        f"  Crop  : {describe_crop(bounds)}\n"
+        f"  Size  : {f'{size[0]}x{size[1]} ({interp})' if size else 'native'}\n"
+        f"  Output: {out}"
+    )
+
+    with profiling.span("ffmpeg") as timing:
+        if segments > 1:
+            _extract_segmented(video, out, segments, None, size, interp, bounds)
+        else:
+            cmd = [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel", "error",
+                "-skip_frame", "nokey",
+                "-i", video,
+            ]
+            filters = _crop_filter(bounds) + _scale_filter(size, interp)
+            if filters:
+                cmd += ["-vf", ",".join(filters)]
+            cmd += [
+                "-vsync", "vfr",
+                f"{out}/%06d.png",
+            ]
+
+            subprocess.run(cmd, check=True)
+        timing.frames = _count_frames(out)
+    _write_manifest(out, video, "keyframes", size, interp, crop=crop, bounds=bounds)
+
+    console.print("[green]✔ Keyframe extraction complete[/green]")
+
+
+def extract_shots(
+    video: str,
+    out_dir: str,
+    threshold: float = SHOT_THRESHOLD,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    crop: str = "frame",
+) -> None:
+    """
+    Extract one frame per shot, at each detected scene change.
+    Shot start/end times and frame counts are stored in the manifest.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    bounds = resolve_crop(video, crop)
+
+    console.print(
+        "[bold cyan]▶ Extracting shots[/bold cyan]\n"
+        f"  Video : {video}\n"
+        f"  Mode  : one frame per shot (scene > {threshold})\n"
+        f"  Crop  : {describe_crop(bounds)}\n"
+        f"  Size  : {f'{size[0]}x{size[1]} ({interp})' if size else 'native'}\n"
         f"  Output: {out}"
     )
 
+    # Crop and scale first so scene detection runs on small frames without bars
+    filters = _crop_filter(bounds) + _scale_filter(size, interp) + _shot_filters(threshold)
+
     cmd = [
         "ffmpeg",
         "-hide_banner",
-        "-loglevel", "error",
-        "-skip_frame", "nokey",
+        "-nostats",
+        "-loglevel", "info",
+        "-copyts",
         "-i", video,
+        "-vf", ",".join(filters),
         "-vsync", "vfr",
         f"{out}/%06d.png",
     ]
 
-    subprocess.run(cmd, check=True)
+    with profiling.span("ffmpeg") as timing:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            console.print(result.stderr[-2000:], markup=False)
+            raise subprocess.CalledProcessError(result.returncode, cmd)
 
-    console.print("[green]✔ Keyframe extraction complete[/green]")
+        starts = [float(m.group(1)) for m in map(_SHOWINFO_TIME.search, result.stderr.splitlines()) if m]
+        timing.frames = len(starts)
+    end, fps = _timing(_probe(video))
+    shots = _shots(starts, end, fps)
+    _write_manifest(out, video, f"shots-{threshold}", size, interp, shots, crop=crop, bounds=bounds)
+
+    console.print(f"[green]✔ Shot extraction complete ({len(shots)} shots)[/green]")
+
+
+def extract_interval(
+    video: str,
+    out_dir: str,
+    interval: float,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    snap: bool = False,
+    crop: str = "frame",
+) -> None:
+    """
+    Extract one frame every `interval` seconds by seeking to each target
+    time, so only the frames around the targets are decoded.
+    Sample times and spans are stored in the manifest.
+    """
+    import cv2
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    bounds = resolve_crop(video, crop)
+
+    console.print(
+        "[bold cyan]▶ Extracting samples[/bold cyan]\n"
+        f"  Video : {video}\n"
+        f"  Mode  : one frame every {interval:g}s{' (snapped to keyframes)' if snap else ''}\n"
+        f"  Crop  : {describe_crop(bounds)}\n"
+        f"  Size  : {f'{size[0]}x{size[1]} ({interp})' if size else 'native'}\n"
+        f"  Output: {out}"
+    )
+
+    samples = []
+    for i, (frame, sample) in enumerate(stream_interval(video, interval, size, interp, snap, bounds)):
+        with profiling.span("png_write"):
+            cv2.imwrite(str(out / f"{i + 1:06d}.png"), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        samples.append(sample)
+    mode = f"interval-{interval}{'-keyframes' if snap else ''}"
+    _write_manifest(out, video, mode, size, interp, samples=samples, crop=crop, bounds=bounds)
+
+    console.print(f"[green]✔ Sample extraction complete ({len(samples)} frames)[/green]")
+
+
+def _probe(video: str) -> VideoInfo:
+    """
+    Probe a video, exiting with an error if it cannot be read.
+    """
+    try:
+        return probe(video)
+    except ProbeError as e:
+        console.print(f"[red]✖ Could not read {video}: {e}[/red]")
+        raise SystemExit(1)
+
+
+def _timing(info: VideoInfo) -> tuple[float, float]:
+    """
+    (end time, fps) of a video, needed to turn shot starts into shots.
+    Times are on the video's own timeline, which begins at its start time.
+    """
+    if info.duration is None or info.fps is None:
+        console.print("[red]✖ Could not determine duration and frame rate[/red]")
+        raise SystemExit(1)
+    return (info.start_time or 0.0) + info.duration, info.fps
+
+
+def _frame_size(
+    video: str | VideoInfo,
+    size: tuple[int, int] | None,
+    crop: tuple[int, int, int, int] | None,
+) -> tuple[int, int]:
+    """
+    Size of decoded frames: the scaled size, else the crop box, else the
+    video's own size.
+    """
+    if size:
+        return size
+    if crop:
+        return crop[0], crop[1]
+    return (video if isinstance(video, VideoInfo) else _probe(video)).size
+
+
+def stream_frames(
+    video: str,
+    n: int = 24,
+    keyframes: bool = False,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    crop: tuple[int, int, int, int] | None = None,
+) -> Iterator[np.ndarray]:
+    """
+    Decode frames with ffmpeg straight into memory, without writing images.
+
+    ffmpeg writes raw rgb24 frames to stdout; each one is read into its own
+    (height, width, 3) uint8 array. Frame selection matches extract_every_n
+    and extract_keyframes. A crop box from resolve_crop is cut out before
+    scaling. If size or crop is given, no probe is needed.
+    """
+    width, height = _frame_size(video, size, crop)
+
+    filters = [] if keyframes else [f"select=not(mod(n\\,{n}))"]
+    filters += _crop_filter(crop) + _scale_filter(size, interp)
+
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+    if keyframes:
+        cmd += ["-skip_frame", "nokey"]
+    cmd += ["-i", video]
+    if filters:
+        cmd += ["-vf", ",".join(filters)]
+    cmd += ["-vsync", "vfr", "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"]
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=width * height * 3)
+
+    try:
+        yield from _read_frames(proc, width, height)
+    finally:
+        _stop(proc)
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _read_frames(proc: subprocess.Popen, width: int, height: int) -> Iterator[np.ndarray]:
+    """
+    Read raw rgb24 frames from ffmpeg's stdout, one array per frame.
+    """
+    frame_size = width * height * 3
+    while True:
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        view = memoryview(frame).cast("B")
+        filled = 0
+        while filled < frame_size:
+            count = proc.stdout.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        if filled < frame_size:
+            return
+        yield frame
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    """
+    Close ffmpeg's output and make sure the process is gone.
+    """
+    proc.stdout.close()
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+def stream_shots(
+    video: str,
+    threshold: float = SHOT_THRESHOLD,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    crop: tuple[int, int, int, int] | None = None,
+) -> Iterator[tuple[np.ndarray, dict]]:
+    """
+    Decode the first frame of every shot straight into memory.
+
+    Yields (frame, shot) pairs, where shot holds the start/end time and
+    frame count as in the extract manifest. A shot's end is only known when
+    the next one starts, so each pair is yielded one shot late.
+    """
+    info = _probe(video)
+    width, height = _frame_size(info, size, crop)
+    end, fps = _timing(info)
+
+    filters = _crop_filter(crop) + _scale_filter(size, interp) + _shot_filters(threshold)
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "info",
+        "-copyts",
+        "-i", video,
+        "-vf", ",".join(filters),
+        "-vsync", "vfr", "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1",
+    ]
+
+    yield from _with_spans(_timed_frames(cmd, width, height), end, fps)
+
+
+def _timed_frames(cmd: list[str], width: int, height: int) -> Iterator[tuple[np.ndarray, float]]:
+    """
+    Run an ffmpeg command whose filter graph ends in showinfo and yield
+    (frame, pts_time) pairs.
+    """
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=width * height * 3, text=False,
+    )
+
+    # showinfo logs each frame's time on stderr before the frame is written
+    times = queue.Queue()
+    log = deque(maxlen=20)
+
+    def read_log():
+        for line in proc.stderr:
+            line = line.decode(errors="replace").rstrip()
+            match = _SHOWINFO_TIME.search(line)
+            if match:
+                times.put(float(match.group(1)))
+            else:
+                log.append(line)
+        times.put(None)
+
+    reader = threading.Thread(target=read_log, daemon=True)
+    reader.start()
+
+    try:
+        for frame in _read_frames(proc, width, height):
+            start = times.get()
+            if start is None:
+                break
+            yield frame, start
+    finally:
+        _stop(proc)
+        reader.join()
+        proc.stderr.close()
+
+    if proc.returncode != 0:
+        console.print("\n".join(log), markup=False)
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _with_spans(
+    frames: Iterator[tuple[np.ndarray, float]],
+    end: float,
+    fps: float,
+) -> Iterator[tuple[np.ndarray, dict]]:
+    """
+    Turn (frame, start time) pairs into (frame, span) pairs, where each
+    span lasts until the next frame's start. A span's end is only known
+    when the next frame arrives, so each pair is yielded one frame late.
+    """
+    previous = None
+    for frame, start in frames:
+        if previous is not None:
+            yield previous[0], _shots([previous[1]], start, fps)[0]
+        previous = frame, start
+
+    if previous is not None:
+        yield previous[0], _shots([previous[1]], end, fps)[0]
+
+
+def _interval_targets(info: VideoInfo, interval: float) -> list[float]:
+    """
+    Sample times from the start of the video, one every interval seconds.
+    """
+    t0 = info.start_time or 0.0
+    count = max(1, int(info.duration // interval) + (info.duration % interval > 0))
+    return [t0 + i * interval for i in range(count)]
+
+
+def _seek_frame(
+    video: str,
+    t: float,
+    t0: float,
+    width: int,
+    height: int,
+    filters: list[str],
+) -> np.ndarray | None:
+    """
+    Decode the first frame at or after time t of a video starting at t0.
+
+    -ss before -i seeks to the keyframe preceding t and decodes only
+    from there; ffmpeg counts it from the start of the video, so the
+    seek is t - t0. Returns None when there is no frame at t.
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-threads", "1", "-ss", repr(t - t0), "-i", video,
+           "-frames:v", "1"]
+    if filters:
+        cmd += ["-vf", ",".join(filters)]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"]
+
+    with profiling.span("seek"):
+        result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        console.print(result.stderr.decode(errors="replace")[-2000:], markup=False)
+        raise subprocess.CalledProcessError(result.returncode, cmd)
+
+    frame_size = width * height * 3
+    if len(result.stdout) < frame_size:
+        return None
+    return np.frombuffer(result.stdout, dtype=np.uint8, count=frame_size).reshape(height, width, 3).copy()
+
+
+def _seek_frames(
+    video: str,
+    targets: list[float],
+    start: float,
+    width: int,
+    height: int,
+    filters: list[str],
+) -> Iterator[tuple[np.ndarray, float]]:
+    """
+    Seek to every target time with its own short ffmpeg process, several
+    at a time, and yield (frame, time) pairs in order. Targets are on the
+    video's own timeline, which begins at start.
+    """
+    jobs = os.cpu_count() or 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for t in targets:
+                pending.append((t, pool.submit(_seek_frame, video, t, start, width, height, filters)))
+                # Keep a bounded number of seeks in flight, yielding in order
+                while len(pending) > 2 * jobs or (pending and pending[0][1].done()):
+                    t0, future = pending.popleft()
+                    frame = future.result()
+                    if frame is not None:
+                        yield frame, t0
+            while pending:
+                t0, future = pending.popleft()
+                frame = future.result()
+                if frame is not None:
+                    yield frame, t0
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def stream_interval(
+    video: str,
+    interval: float,
+    size: tuple[int, int] | None = None,
+    interp: str = "area",
+    snap: bool = False,
+    crop: tuple[int, int, int, int] | None = None,
+) -> Iterator[tuple[np.ndarray, dict]]:
+    """
+    Decode one frame every `interval` seconds straight into memory.
+
+    Instead of decoding the whole video and selecting frames, ffmpeg
+    seeks to each target time and decodes from the preceding keyframe.
+    With snap, a single ffmpeg pass decodes keyframes only and keeps the
+    first one in each interval, which is faster still; intervals without
+    a keyframe are then skipped. Yields (frame, sample) pairs with
+    start/end/frames like stream_shots.
+    """
+    info = _probe(video)
+    width, height = _frame_size(info, size, crop)
+    end, fps = _timing(info)
+    t0 = info.start_time or 0.0
+    filters = _crop_filter(crop) + _scale_filter(size, interp)
+
+    if snap:
+        bucket = f"floor((t-{t0!r})/{interval!r})"
+        prev_bucket = f"floor((prev_selected_t-{t0!r})/{interval!r})"
+        select = f"select=isnan(prev_selected_t)+gt({bucket}\\,{prev_bucket})"
+        cmd = [
+            "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "info",
+            "-skip_frame", "nokey",
+            "-copyts",
+            "-i", video,
+            "-vf", ",".join([select, "showinfo"] + filters),
+            "-vsync", "vfr", "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1",
+        ]
+        frames = _timed_frames(cmd, width, height)
+    else:
+        frames = _seek_frames(video, _interval_targets(info, interval), t0, width, height, filters)
+
+    yield from _with_spans(frames, end, fps)
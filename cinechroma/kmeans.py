@@ -0,0 +1,149 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import numpy as np
+
+
+def _sample(weights: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    """
+    Draw indices per row with probability proportional to weights (B, N).
+    draws holds uniform numbers shared by every row; returns (B, len(draws)).
+    """
+    cums = np.cumsum(weights, axis=1)
+    target = draws[None, :] * cums[:, -1:]
+    idx = (cums[:, None, :] <= target[:, :, None]).sum(axis=2)
+    return np.minimum(idx, weights.shape[1] - 1)
+
+
+def _sq_norm(v: np.ndarray) -> np.ndarray:
+    """
+    Squared norm over the last axis, summed channel by channel; numpy's
+    reductions are slow over an axis of length 3.
+    """
+    out = v[..., 0] ** 2
+    for j in range(1, v.shape[-1]):
+        out += v[..., j] ** 2
+    return out
+
+
+def _sq_distances(x: np.ndarray, x_sq: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """
+    Squared distances (B, N, K) between points (B, N, D) and centers (B, K, D).
+    Every entry is computed element-wise, so a set's result never depends
+    on the other sets in the batch.
+    """
+    cross = x[:, :, None, 0] * centers[:, None, :, 0]
+    for j in range(1, x.shape[2]):
+        cross += x[:, :, None, j] * centers[:, None, :, j]
+    return x_sq[:, :, None] - 2 * cross + _sq_norm(centers)[:, None, :]
+
+
+def _init_centers(x: np.ndarray, w: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Greedy k-means++ seeding, as in scikit-learn: each new center is the
+    best of a few candidates drawn proportionally to squared distance.
+    """
+    b = x.shape[0]
+    rows = np.arange(b)
+    n_local = 2 + int(np.log(k))
+
+    centers = np.zeros((b, k, x.shape[2]), dtype=x.dtype)
+    centers[:, 0] = x[rows, _sample(w, rng.random(1))[:, 0]]
+    closest = _sq_norm(x - centers[:, :1])
+
+    for c in range(1, k):
+        prob = w * closest
+        # Sets with every point on a center fall back to plain weights
+        prob = np.where(prob.sum(axis=1, keepdims=True) > 0, prob, w)
+        candidates = x[rows[:, None], _sample(prob, rng.random(n_local))]
+
+        dist = _sq_norm(x[:, None, :, :] - candidates[:, :, None, :])
+        dist = np.minimum(closest[:, None, :], dist)
+        best = (w[:, None, :] * dist).sum(axis=2).argmin(axis=1)
+
+        centers[:, c] = candidates[rows, best]
+        closest = dist[rows, best]
+
+    return centers
+
+
+def batched_kmeans(
+    x: np.ndarray,
+    mask: np.ndarray,
+    k: int,
+    weights: np.ndarray | None = None,
+    max_iter: int = 100,
+    seed: int = 0,
+):
+    """
+    Lloyd's k-means over a stack of B point sets at once.
+
+    Args:
+        x: Points, (B, N, D); rows of short sets are padded
+        mask: Valid points, (B, N) bool
+        k: Clusters per set, lowered to the number of valid points
+        weights: Optional point weights, (B, N)
+        max_iter: Lloyd iterations before giving up on convergence
+        seed: Seed of the k-means++ initialization
+
+    Returns:
+        (centers, counts, ks): centers (B, k, D) ordered by weighted cluster
+        size, largest first, their sizes (B, k), and the k used for each set.
+        Slots beyond ks[b] are unused.
+
+    Every set is seeded with the same random draws and iterated until its
+    labels stop changing; converged sets drop out of the remaining
+    iterations. A set's result therefore does not depend on its batch.
+    """
+    b, n, d = x.shape
+    x = x.astype(np.float32)
+    w = mask.astype(np.float32) if weights is None else (weights * mask).astype(np.float32)
+    x_sq = _sq_norm(x)
+
+    ks = np.minimum(k, mask.sum(axis=1))
+    centers = _init_centers(x, w, k, np.random.default_rng(seed))
+    unused = np.arange(k)[None, :] >= ks[:, None]
+
+    labels = np.full((b, n), -1)
+    active = np.arange(b)
+
+    for _ in range(max_iter):
+        dist = _sq_distances(x[active], x_sq[active], centers[active])
+        dist[np.broadcast_to(unused[active][:, None, :], dist.shape)] = np.inf
+        new_labels = dist.argmin(axis=2)
+
+        changed = (new_labels != labels[active]).any(axis=1)
+        active, new_labels = active[changed], new_labels[changed]
+        if len(active) == 0:
+            break
+        labels[active] = new_labels
+
+        flat = (new_labels + (np.arange(len(active)) * k)[:, None]).ravel()
+        wa = w[active]
+        counts = np.bincount(flat, weights=wa.ravel(), minlength=len(active) * k).reshape(-1, k)
+        sums = np.stack([
+            np.bincount(flat, weights=(wa * x[active, :, j]).ravel(), minlength=len(active) * k)
+            for j in range(d)
+        ], axis=-1).reshape(-1, k, d)
+
+        # Empty clusters keep their previous center
+        filled = counts > 0
+        updated = centers[active]
+        updated[filled] = sums[filled] / counts[filled][:, None]
+        centers[active] = updated
+
+    flat = (np.maximum(labels, 0) + (np.arange(b) * k)[:, None]).ravel()
+    counts = np.bincount(flat, weights=w.ravel(), minlength=b * k).reshape(b, k)
+    counts[unused] = -1
+
+    order = np.argsort(-counts, axis=1, kind="stable")
+    centers = np.take_along_axis(centers, order[:, :, None], axis=1)
+    counts = np.take_along_axis(counts, order, axis=1)
+
+    return centers.astype(np.float64), counts, ks
@@ -0,0 +1,25 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+# Values the CLI offers as choices and defaults. They live here, free of
+# heavy imports, so building the argument parser does not load the
+# modules that implement them.
+
+# ffmpeg scaler flags accepted for decode-time downscaling
+INTERPOLATIONS = ("area", "bilinear", "bicubic", "neighbor", "lanczos")
+
+# Default ffmpeg scene-change score that starts a new shot
+SHOT_THRESHOLD = 0.4
+
+# Crop modes besides an explicit W:H:X:Y box: per-frame letterbox
+# removal during analysis, one matte detected for the whole video, or none
+CROP_MODES = ("frame", "auto", "none")
+
+# Strip variants: per-frame dominant or mean color, or stacked palettes
+STRIP_TYPES = ("dominant", "mean", "palette")
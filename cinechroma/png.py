@@ -0,0 +1,73 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Compressed bytes collected before an IDAT chunk is written
+CHUNK_SIZE = 1 << 20
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(path: Path, rows: Iterable[np.ndarray], width: int, height: int) -> None:
+    """
+    Write an 8-bit RGB PNG one row at a time.
+
+    rows yields `height` uint8 arrays of shape (width, 3). Only one row and
+    the compressor state are held in memory. A row that is the same object
+    as the previous one is encoded with the Up filter as all zeros, so
+    repeating a row costs almost nothing to compress.
+    """
+    compressor = zlib.compressobj(6)
+    zeros = b"\x02" + bytes(width * 3)
+    pending = []
+    pending_size = 0
+
+    with open(path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+
+        def emit(data: bytes, flush: bool = False) -> None:
+            nonlocal pending_size
+            if data:
+                pending.append(data)
+                pending_size += len(data)
+            if pending and (flush or pending_size >= CHUNK_SIZE):
+                f.write(_chunk(b"IDAT", b"".join(pending)))
+                pending.clear()
+                pending_size = 0
+
+        previous = None
+        written = 0
+        for row in rows:
+            if row is previous:
+                emit(compressor.compress(zeros))
+            else:
+                previous = row
+                row = np.ascontiguousarray(row, dtype=np.uint8)
+                if row.shape != (width, 3):
+                    raise ValueError(f"row shape {row.shape} does not match width {width}")
+                emit(compressor.compress(b"\x00" + row.tobytes()))
+            written += 1
+
+        if written != height:
+            raise ValueError(f"got {written} rows, expected {height}")
+
+        emit(compressor.flush(), flush=True)
+        f.write(_chunk(b"IEND", b""))
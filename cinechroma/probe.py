@@ -0,0 +1,189 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+
+from cinechroma.ui import console
+from cinechroma.utils import cache_dir
+
+
+# Every stream/format field any command needs, fetched in one ffprobe call
+STREAM_FIELDS = "width,height,avg_frame_rate,start_time,codec_name,pix_fmt,color_primaries,color_transfer"
+FORMAT_FIELDS = "duration"
+
+# Bumped whenever VideoInfo gains or changes fields
+PROBE_CACHE_VERSION = 2
+
+
+class ProbeError(RuntimeError):
+    """
+    ffprobe is missing, failed, or returned unusable metadata.
+    """
+
+
+@dataclass(frozen=True)
+class VideoInfo:
+    """
+    Metadata of a video's first video stream.
+    Fields ffprobe did not report are None.
+    """
+
+    width: int
+    height: int
+    fps: float | None
+    duration: float | None
+    start_time: float | None
+    codec: str | None
+    pix_fmt: str | None
+    color_primaries: str | None
+    color_transfer: str | None
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+
+def _identity(path: str) -> str:
+    """
+    Key of a file as it is right now: resolved path, size and mtime.
+    """
+    st = os.stat(path)
+    text = f"{os.path.realpath(path)}:{st.st_size}:{st.st_mtime_ns}:{PROBE_CACHE_VERSION}"
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _parse_rate(rate: str | None) -> float | None:
+    try:
+        num, denom = map(int, rate.split("/"))
+        return num / denom if num and denom else None
+    except (AttributeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _parse_float(value: str | None) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _run_ffprobe(path: str) -> VideoInfo:
+    if shutil.which("ffprobe") is None:
+        raise ProbeError("ffprobe not found")
+
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", f"stream={STREAM_FIELDS}:format={FORMAT_FIELDS}",
+        "-of", "json",
+        path,
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout)
+        stream = data["streams"][0]
+        width, height = int(stream["width"]), int(stream["height"])
+    except subprocess.CalledProcessError as e:
+        raise ProbeError(f"ffprobe failed: {e.stderr.strip() or e}") from None
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+        raise ProbeError(f"no video stream found in {path}") from None
+
+    return VideoInfo(
+        width=width,
+        height=height,
+        fps=_parse_rate(stream.get("avg_frame_rate")),
+        duration=_parse_float(data.get("format", {}).get("duration")),
+        start_time=_parse_float(stream.get("start_time")),
+        codec=stream.get("codec_name"),
+        pix_fmt=stream.get("pix_fmt"),
+        color_primaries=stream.get("color_primaries"),
+        color_transfer=stream.get("color_transfer"),
+    )
+
+
+_memo: dict[str, VideoInfo] = {}
+_memo_lock = threading.Lock()
+
+
+def probe(path: str, persist: bool = True) -> VideoInfo:
+    """
+    Probe a video with a single ffprobe call.
+
+    Results are memoized per process and, with persist, stored under
+    cache_dir()/probe keyed by the file's path, size and mtime, so a file
+    is only probed again after it changes. Raises ProbeError.
+    """
+    path = str(path)
+    try:
+        key = _identity(path)
+    except OSError as e:
+        raise ProbeError(f"cannot read {path}: {e.strerror}") from None
+
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+
+    cached = cache_dir() / "probe" / f"{key}.json"
+    info = None
+    if persist:
+        try:
+            with open(cached) as f:
+                info = VideoInfo(**json.load(f))
+        except (OSError, json.JSONDecodeError, TypeError):
+            info = None
+
+    if info is None:
+        info = _run_ffprobe(path)
+        if persist:
+            try:
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cached.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+                tmp.write_text(json.dumps(dataclasses.asdict(info)))
+                os.replace(tmp, cached)
+            except OSError:
+                # Read-only cache: probe again next time
+                pass
+
+    with _memo_lock:
+        _memo[key] = info
+    return info
+
+
+def get_video_info(video_path: str) -> None:
+    """
+    Display video metadata using ffprobe.
+    """
+    try:
+        info = probe(video_path)
+    except ProbeError as e:
+        console.print(f"[red]✖ {e}[/red]")
+        raise SystemExit(1)
+
+    def show(value) -> str:
+        return "N/A" if value is None else str(value)
+
+    # Display using Rich
+    console.print("\n[bold cyan]📹 Video Information[/bold cyan]\n")
+    console.print(f"  [bold]Resolution:[/bold]       {info.width} × {info.height}")
+    console.print(f"  [bold]Duration:[/bold]         {info.duration or 0:.2f} seconds")
+    console.print(f"  [bold]FPS:[/bold]              {info.fps or 0:.2f}")
+    console.print(f"  [bold]Codec:[/bold]            {show(info.codec)}")
+    console.print(f"  [bold]Pixel Format:[/bold]    {show(info.pix_fmt)}")
+    console.print(f"  [bold]Color Primaries:[/bold] {show(info.color_primaries)}")
+    console.print(f"  [bold]Color Transfer:[/bold]  {show(info.color_transfer)}")
+    console.print()
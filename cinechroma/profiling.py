@@ -0,0 +1,203 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from cinechroma.ui import console
+
+
+# Events of the running profile, or None when profiling is off.
+# Each event is (stage, start_ns, duration_ns, frames, pid, tid).
+_events: list[tuple] | None = None
+
+
+class _Span:
+    """
+    Times a block as one event of a stage covering `frames` frames.
+    frames may be set inside the block once the count is known.
+    """
+
+    __slots__ = ("name", "frames", "start")
+
+    def __init__(self, name: str, frames: int):
+        self.name = name
+        self.frames = frames
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        if _events is not None:
+            _events.append((self.name, self.start, end - self.start, self.frames, os.getpid(),
+                            threading.get_native_id()))
+        return False
+
+
+class _NullSpan:
+    """
+    Stand-in for _Span while profiling is off; ignores everything.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enabled() -> bool:
+    return _events is not None
+
+
+def enable() -> None:
+    """
+    Start recording events, discarding any earlier ones.
+    """
+    global _events
+    _events = []
+
+
+def disable() -> list[tuple]:
+    """
+    Stop recording and return the events recorded so far.
+    """
+    global _events
+    events, _events = _events or [], None
+    return events
+
+
+def merge(events: list[tuple]) -> None:
+    """
+    Add events recorded in another process, e.g. an analysis worker.
+    """
+    if _events is not None:
+        _events.extend(events)
+
+
+def span(name: str, frames: int = 1):
+    """
+    Context manager timing one event of stage `name`.
+    Returns a shared no-op object while profiling is off.
+    """
+    return _NULL_SPAN if _events is None else _Span(name, frames)
+
+
+def timed(items: Iterable, name: str) -> Iterator:
+    """
+    Time how long every item of an iterator takes to produce,
+    e.g. frames arriving from ffmpeg. Returns items unchanged while
+    profiling is off.
+    """
+    if _events is None:
+        return iter(items)
+
+    def generate():
+        it = iter(items)
+        while True:
+            with span(name) as s:
+                try:
+                    item = next(it)
+                except StopIteration:
+                    # The final, empty read is not a frame
+                    s.frames = 0
+                    return
+            yield item
+
+    return generate()
+
+
+def summary(events: list[tuple]) -> dict:
+    """
+    Per-stage totals in seconds, in order of first appearance: total,
+    frames, mean per frame and 95th percentile per frame. An event
+    covering several frames counts as that many frames of equal cost.
+    """
+    stages = {}
+    for name, _, duration, frames, _, _ in events:
+        stages.setdefault(name, []).append((duration, frames))
+
+    result = {}
+    for name, records in stages.items():
+        durations = np.array([d for d, _ in records], dtype=np.float64) / 1e9
+        frames = np.array([f for _, f in records], dtype=np.int64)
+        counted = frames > 0
+        per_frame = np.repeat(durations[counted] / frames[counted], frames[counted])
+        result[name] = {
+            "total": float(durations.sum()),
+            "events": len(records),
+            "frames": int(frames.sum()),
+            "mean": float(per_frame.mean()) if len(per_frame) else 0.0,
+            "p95": float(np.percentile(per_frame, 95)) if len(per_frame) else 0.0,
+        }
+    return result
+
+
+def print_summary(stages: dict) -> None:
+    console.print("\n[bold cyan]▶ Profile[/bold cyan]")
+    console.print(f"  {'Stage':<16} {'Total':>9} {'Frames':>8} {'Mean':>10} {'p95':>10}")
+    for name, stage in stages.items():
+        # Stages that run once per run, not per frame, have no frame statistics
+        per_frame = (
+            f"{stage['mean'] * 1000:>8.2f}ms {stage['p95'] * 1000:>8.2f}ms" if stage["frames"] else f"{'-':>10} {'-':>10}"
+        )
+        console.print(f"  {name:<16} {stage['total']:>8.2f}s {stage['frames']:>8} {per_frame}")
+
+
+def write_trace(path: str, events: list[tuple], stages: dict) -> None:
+    """
+    Write events in Chrome trace-event format, viewable in
+    chrome://tracing or Perfetto. The summary goes into otherData.
+    """
+    origin = min((start for _, start, *_ in events), default=0)
+    trace = {
+        "traceEvents": [
+            {
+                "name": name, "cat": "cinechroma", "ph": "X",
+                "ts": (start - origin) / 1000, "dur": duration / 1000,
+                "pid": pid, "tid": tid, "args": {"frames": frames},
+            }
+            for name, start, duration, frames, pid, tid in events
+        ],
+        "displayTimeUnit": "ms",
+        "otherData": {"stages": stages},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(trace, f)
+
+
+def report(trace_path: str | None = None) -> None:
+    """
+    Stop profiling, print the per-stage summary and optionally write
+    a Chrome trace.
+    """
+    events = disable()
+    stages = summary(events)
+    print_summary(stages)
+    if trace_path:
+        write_trace(trace_path, events, stages)
+        console.print(f"  Trace  : {trace_path} ({len(events)} events)")
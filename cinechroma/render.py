@@ -6,18 +6,18 @@ See README.md for:
 - data model
 """
 
-import json
 import numpy as np
 from pathlib import Path
 from PIL import Image
-from skimage.color import lab2rgb
 
+from cinechroma.color import lab_to_rgb8
+from cinechroma.png import write_png
+from cinechroma.results import iter_frames, read_palettes
 from cinechroma.ui import console
 
 
 def _lab_to_rgb(lab):
-    rgb = lab2rgb(np.array(lab).reshape(1, 1, 3))[0, 0]
-    return (np.clip(rgb, 0, 1) * 255).astype(np.uint8)
+    return lab_to_rgb8(lab)
 
 
 def render_palette_bars(json_path: str, height_per_bar: int = 100, out_path: str = None) -> None:
@@ -38,15 +38,14 @@ def render_palette_bars(json_path: str, height_per_bar: int = 100, out_path: str
         f"  Height: {height_per_bar * 4}"
     )
 
-    with open(json_path) as f:
-        data = json.load(f)
+    # Streams past the frames; only the palettes are kept
+    palettes = read_palettes(json_path)
 
     # Check if palettes exist in the JSON
-    if "palettes" not in data:
+    if palettes is None:
         console.print("[red]✖ No palettes found in analysis JSON. Re-run analysis.[/red]")
         raise SystemExit(1)
 
-    palettes = data["palettes"]
     categories = ["light", "medium", "dark", "overall"]
     
     bars = []
@@ -82,9 +81,136 @@ def render_palette_bars(json_path: str, height_per_bar: int = 100, out_path: str
     console.print(f"[green]✔ Palette bars saved to {out_path}[/green]")
 
 
-def render_color_strip(json_path: str, height: int = 400, out_path: str = None) -> None:
+def _load_strip(json_path: Path, strip: str):
+    """
+    Read what a strip needs from every frame in one streaming pass.
+
+    Returns (times, durations, colors, shares): durations is None unless
+    entries stand for shots of varying length; colors is (n, 3) Lab for
+    dominant and mean strips, or (n, K, 3) padded palettes for palette
+    strips, with shares (n, K) holding each palette color's share (zero
+    for padding).
+    """
+    times, durations, colors, shares = [], [], [], []
+    for i, entry in enumerate(iter_frames(json_path)):
+        times.append(entry.get("time", i))
+        durations.append(entry.get("duration", np.nan))
+        if strip == "palette":
+            palette = entry["palette_lab"]
+            colors.append(palette)
+            # Analyses without palette_weights show colors in equal parts
+            shares.append(entry.get("palette_weights") or [1.0] * len(palette))
+        else:
+            colors.append(entry[f"{strip}_lab"])
+
+    times = np.asarray(times, dtype=np.float64)
+    durations = np.asarray(durations, dtype=np.float64)
+    durations = None if np.isnan(durations).any() else durations
+    if strip != "palette":
+        return times, durations, np.asarray(colors, dtype=np.float32).reshape(-1, 3), None
+
+    k = max((len(p) for p in colors), default=0)
+    padded = np.zeros((len(colors), k, 3), dtype=np.float32)
+    weights = np.zeros((len(colors), k), dtype=np.float64)
+    for j, (palette, share) in enumerate(zip(colors, shares)):
+        padded[j, :len(palette)] = palette
+        weights[j, :len(share)] = share
+    return times, durations, padded, weights
+
+
+def _time_bins(
+    times: np.ndarray, width: int, durations: np.ndarray | None = None,
+) -> tuple[np.ndarray, float, float]:
+    """
+    Assign every frame to one of `width` equal time bins.
+    The last frame is given its duration, or one typical frame gap, so it
+    gets a full bin rather than the right edge. Returns (bins, start, span).
+    """
+    start = times.min()
+    if durations is not None:
+        end = float((times + durations).max())
+    else:
+        gaps = np.diff(np.sort(times))
+        end = times.max() + (float(np.median(gaps)) if len(gaps) else 1.0)
+    span = float(end - start) or 1.0
+
+    bins = ((times - start) / span * width).astype(np.int64)
+    return np.clip(bins, 0, width - 1), start, span
+
+
+def _bin_means(
+    values: np.ndarray, bins: np.ndarray, width: int, weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Mean Lab color of each bin in one bincount, optionally weighted;
+    empty bins repeat the previous bin.
+    """
+    weights = np.ones(len(values)) if weights is None else weights
+    flat = (bins[:, None] * 3 + np.arange(3)).ravel()
+    sums = np.bincount(flat, weights=(values * weights[:, None]).ravel(), minlength=width * 3).reshape(width, 3)
+    counts = np.bincount(bins, weights=weights, minlength=width)
+
+    # The first bin always holds the earliest frame
+    source = np.maximum.accumulate(np.where(counts > 0, np.arange(width), 0))
+    return sums[source] / counts[source, None]
+
+
+def _nearest_frames(
+    times: np.ndarray, start: float, span: float, width: int, shots: bool = False,
+) -> np.ndarray:
+    """
+    Index of the frame closest to the centre of each bin, or with shots,
+    of the shot the centre falls in.
+    """
+    centres = start + (np.arange(width) + 0.5) * span / width
+    order = np.argsort(times, kind="stable")
+    if len(order) == 1:
+        return np.zeros(width, dtype=np.int64)
+
+    sorted_times = times[order]
+    if shots:
+        return order[np.clip(np.searchsorted(sorted_times, centres, side="right") - 1, 0, len(order) - 1)]
+    right = np.clip(np.searchsorted(sorted_times, centres), 1, len(order) - 1)
+    left = right - 1
+    closer_left = centres - sorted_times[left] <= sorted_times[right] - centres
+    return order[np.where(closer_left, left, right)]
+
+
+def _palette_rows(colors: np.ndarray, shares: np.ndarray, height: int):
+    """
+    Yield the rows of a palette strip, where each column stacks its
+    palette colors top to bottom in proportion to their shares.
+    """
+    cum = np.cumsum(shares, axis=1)
+    cum /= np.maximum(cum[:, -1:], 1e-12)
+    columns = np.arange(len(colors))
+    last = colors.shape[1] - 1
+
+    previous, row = None, None
+    for r in range(height):
+        index = np.minimum((cum <= (r + 0.5) / height).sum(axis=1), last)
+        # Rows inside the same color bands are the same object for the PNG writer
+        if previous is None or not np.array_equal(index, previous):
+            row = colors[columns, index]
+            previous = index
+        yield row
+
+
+def render_color_strip(
+    json_path: str,
+    height: int = 400,
+    out_path: str = None,
+    width: int | None = None,
+    strip: str = "dominant",
+) -> None:
     """
     Render a full-film color strip from analysis JSON.
+
+    Without width, each analyzed frame is one pixel column. With width,
+    frames are grouped into that many equal time bins: dominant and mean
+    strips average the colors of each bin, palette strips show the frame
+    closest to the bin centre. Shot-sampled analyses are weighted by shot
+    duration, and each shot fills the bins it spans.
     """
     json_path = Path(json_path)
     if out_path is None:
@@ -96,26 +222,32 @@ def render_color_strip(json_path: str, height: int = 400, out_path: str = None)
     console.print(
         "[bold cyan]▶ Rendering color strip[/bold cyan]\n"
         f"  Input : {json_path}\n"
-        f"  Height: {height}"
+        f"  Strip : {strip}\n"
+        f"  Size  : {f'{width}' if width else 'one column per frame'} x {height}"
     )
 
-    with open(json_path) as f:
-        data = json.load(f)
-    
-    # Handle both old and new JSON formats
-    if "frames" in data:
-        frames_data = data["frames"]
-    else:
-        frames_data = data
-
-    strip = []
-    for entry in frames_data:
-        rgb = _lab_to_rgb(entry["dominant_lab"])
-        strip.append(rgb)
-
-    strip = np.array(strip).reshape(1, -1, 3)
-    strip = np.repeat(strip, height, axis=0)
+    # Streams JSON (old and new layout) or NDJSON analysis files
+    times, durations, labs, shares = _load_strip(json_path, strip)
+    if not len(labs):
+        console.print("[red]✖ No frames found in analysis JSON.[/red]")
+        raise SystemExit(1)
 
-    Image.fromarray(strip).save(out_path)
+    if width:
+        # Shots cover their whole duration and are weighted by it
+        bins, start, span = _time_bins(times, width, durations)
+        if strip == "palette":
+            nearest = _nearest_frames(times, start, span, width, shots=durations is not None)
+            labs, shares = labs[nearest], shares[nearest]
+        else:
+            labs = _bin_means(labs, bins, width, durations)
+
+    # One conversion for all columns
+    colors = _lab_to_rgb(labs)
+    if strip == "palette":
+        rows = _palette_rows(colors, shares, height)
+    else:
+        # The row is repeated while encoding
+        rows = (colors for _ in range(height))
+    write_png(out_path, rows, len(colors), height)
 
     console.print(f"[green]✔ Color strip saved to {out_path}[/green]")
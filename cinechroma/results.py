@@ -0,0 +1,224 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import json
+import textwrap
+from pathlib import Path
+from typing import Iterator
+
+
+# Output formats of analyze
+FORMATS = ("json", "ndjson")
+
+# Extensions that select NDJSON output when --format is not given
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def output_format(path: str, fmt: str | None = None) -> str:
+    """
+    Pick the output format: explicit --format, else from the file extension.
+    """
+    if fmt:
+        return fmt
+    return "ndjson" if Path(path).suffix.lower() in NDJSON_SUFFIXES else "json"
+
+
+class ResultWriter:
+    """
+    Write analysis results incrementally, one frame at a time.
+
+    json: the same document json.dump(indent=2) would produce, with
+    "frames" followed by "palettes".
+    ndjson: one frame object per line, flushed as it is written so the
+    file can be tailed, then a {"palettes": ...} trailer line.
+    """
+
+    def __init__(self, path: str, fmt: str = "json"):
+        self.path = Path(path)
+        self.fmt = fmt
+        self.count = 0
+        self._f = open(self.path, "w")
+        if fmt == "json":
+            self._f.write('{\n  "frames": [')
+
+    def write_frame(self, entry: dict) -> None:
+        if self.fmt == "ndjson":
+            self._f.write(json.dumps(entry) + "\n")
+            self._f.flush()
+        else:
+            sep = ",\n" if self.count else "\n"
+            self._f.write(sep + textwrap.indent(json.dumps(entry, indent=2), "    "))
+        self.count += 1
+
+    def finish(self, palettes: dict) -> None:
+        """
+        Write the movie palettes and close the file.
+        """
+        if self.fmt == "ndjson":
+            self._f.write(json.dumps({"palettes": palettes}) + "\n")
+        else:
+            end = "\n  ]" if self.count else "]"
+            body = textwrap.indent(json.dumps(palettes, indent=2), "  ").lstrip()
+            self._f.write(f'{end},\n  "palettes": {body}\n}}')
+        self._f.close()
+
+    def discard(self) -> None:
+        """
+        Close and delete an incomplete output file.
+        """
+        self._f.close()
+        self.path.unlink(missing_ok=True)
+
+
+class _JsonStream:
+    """
+    Pull-parser over a JSON file that decodes one value at a time,
+    so arrays can be iterated without loading the whole document.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Next non-whitespace character, or "" at end of file.
+        """
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"expected one of {chars!r} at offset {self.pos}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending exactly at the buffer end may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def array(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def _is_ndjson(path: Path) -> bool:
+    """
+    NDJSON files start with a complete JSON object on their first line:
+    a frame entry, or the palettes trailer of an empty analysis. A JSON
+    document written on a single line holds a "frames" array instead.
+    """
+    with open(path) as f:
+        first = f.readline()
+    try:
+        record = json.loads(first)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(record, dict) and "frames" not in record
+
+
+def _json_records(path: Path) -> Iterator[tuple[str, object]]:
+    """
+    Yield ("frame", entry) for every frame, then (key, value) for other
+    top-level fields, streaming through a JSON analysis file.
+    Also accepts the legacy format, a bare list of frames.
+    """
+    with open(path) as f:
+        stream = _JsonStream(f)
+        if stream.peek() == "[":
+            for entry in stream.array():
+                yield "frame", entry
+            return
+
+        stream.expect("{")
+        while stream.peek() != "}":
+            key = stream.value()
+            stream.expect(":")
+            if key == "frames":
+                for entry in stream.array():
+                    yield "frame", entry
+            else:
+                yield key, stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+def _ndjson_records(path: Path) -> Iterator[tuple[str, object]]:
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "frame" in record:
+                yield "frame", record
+            else:
+                yield from record.items()
+
+
+def iter_records(path: str) -> Iterator[tuple[str, object]]:
+    """
+    Stream (kind, value) records of an analysis file in either format.
+    kind is "frame" for per-frame entries, otherwise a top-level key
+    such as "palettes".
+    """
+    path = Path(path)
+    return _ndjson_records(path) if _is_ndjson(path) else _json_records(path)
+
+
+def iter_frames(path: str) -> Iterator[dict]:
+    """
+    Stream per-frame entries of an analysis file.
+    """
+    for kind, value in iter_records(path):
+        if kind == "frame":
+            yield value
+
+
+def read_palettes(path: str) -> dict | None:
+    """
+    Movie-level palettes of an analysis file, or None if it has none.
+    """
+    for kind, value in iter_records(path):
+        if kind == "palettes":
+            return value
+    return None
@@ -0,0 +1,88 @@
+""" This file is part of cinechroma.
+See README.md for:
+- project structure
+- workflow
+- responsibilities
+- data model
+"""
+
+
+import numpy as np
+
+
+class ReservoirSampler:
+    """
+    Fixed-size random sample of rows from a stream of arrays.
+
+    Every row gets the key log(u) and the reservoir keeps the rows with
+    the largest keys, a uniform sample without replacement. Rows carry
+    the weight they were added with, to be applied when the sample is
+    used (e.g. as KMeans sample_weight): weighting the selection itself
+    would saturate, as a row can be picked at most once. Memory is fixed
+    at capacity rows however many are added, and the same seed and add
+    order always give the same sample.
+    """
+
+    def __init__(self, capacity: int, dim: int = 3, seed: int = 0):
+        self.capacity = capacity
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.empty((capacity, dim), dtype=np.float32)
+        self._keys = np.empty(capacity)
+        self._weights = np.empty(capacity)
+        self._size = 0
+
+    def add(self, rows: np.ndarray, weight: float = 1.0) -> None:
+        """
+        Offer rows to the reservoir, all carrying the same weight.
+        """
+        m = len(rows)
+        if m == 0 or weight <= 0:
+            return
+        self.seen += m
+        keys = np.log(self._rng.random(m))
+
+        # Fill free slots first
+        free = min(self.capacity - self._size, m)
+        if free:
+            self._rows[self._size:self._size + free] = rows[:free]
+            self._keys[self._size:self._size + free] = keys[:free]
+            self._weights[self._size:self._size + free] = weight
+            self._size += free
+            rows, keys = rows[free:], keys[free:]
+            if not len(rows):
+                return
+
+        # Only rows beating the current minimum can get in
+        hit = keys > self._keys.min()
+        rows, keys = rows[hit], keys[hit]
+        n = len(keys)
+        if n == 0:
+            return
+        if n > self.capacity:
+            top = np.argpartition(keys, -self.capacity)[-self.capacity:]
+            rows, keys, n = rows[top], keys[top], self.capacity
+
+        # The n smallest reservoir keys compete with the n newcomers
+        slots = np.argpartition(self._keys, n - 1)[:n]
+        pool_keys = np.concatenate([self._keys[slots], keys])
+        pool_rows = np.concatenate([self._rows[slots], rows])
+        best = np.argpartition(pool_keys, n)[n:]
+
+        pool_weights = np.concatenate([self._weights[slots], np.full(n, weight)])
+
+        self._keys[slots] = pool_keys[best]
+        self._rows[slots] = pool_rows[best]
+        self._weights[slots] = pool_weights[best]
+
+    def sample(self) -> np.ndarray:
+        """
+        Current sample, at most capacity rows.
+        """
+        return self._rows[:self._size]
+
+    def weights(self) -> np.ndarray:
+        """
+        Weight of every row of the current sample.
+        """
+        return self._weights[:self._size]
@@ -6,25 +6,50 @@ See README.md for:
 - data model
 """
 
+import os
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
-from rich.table import Table
 from rich.align import Align
-from rich.layout import Layout
-from rich.columns import Columns
-import pyfiglet
 
 console = Console()
 
+# Banner text and figlet font (doom, for a bold 3D effect)
+BANNER_TEXT = "CINECHROMA"
+BANNER_FONT = "doom"
+
+
+def _banner_logo() -> str:
+    """
+    The figlet rendering of the banner. It never changes, so it is kept
+    in the cache directory and pyfiglet is only loaded on the first run.
+    """
+    from cinechroma.utils import cache_dir
+
+    path = cache_dir() / f"banner-{BANNER_FONT}.txt"
+    try:
+        return path.read_text()
+    except OSError:
+        pass
+
+    import pyfiglet
+    logo = pyfiglet.figlet_format(BANNER_TEXT, font=BANNER_FONT)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp-{os.getpid()}")
+        tmp.write_text(logo)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return logo
+
 
 def show_banner() -> None:
     """
     Display the cinechroma ASCII banner with professional styling.
     """
-    # Use pyfiglet with doom font for bold 3D effect
-    ascii_logo = pyfiglet.figlet_format("CINECHROMA", font="doom")
+    ascii_logo = _banner_logo()
 
     # Create gradient text with Rich - neon cyan/green/yellow gradient
     text = Text()
@@ -78,6 +103,8 @@ def progress_bar():
     """
     Enhanced progress bar with professional styling.
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+
     return Progress(
         SpinnerColumn(spinner_name="dots"),
         TextColumn("[bold bright_green]{task.description}[/bold bright_green]"),
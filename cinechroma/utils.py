@@ -7,7 +7,13 @@ See README.md for:
 """
 
 
+import argparse
+import hashlib
+import math
+import os
 import shutil
+from pathlib import Path
+from cinechroma.options import CROP_MODES
 from cinechroma.ui import console
 
 
@@ -24,3 +30,131 @@ def check_ffmpeg() -> None:
         raise SystemExit(1)
 
     console.print("[green]✔ ffmpeg found[/green]")
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    """
+    Parse a frame size given as "WxH" or a single number for square frames.
+    Meant to be used as an argparse type.
+    """
+    try:
+        parts = [int(p) for p in value.lower().split("x")]
+    except ValueError:
+        parts = []
+
+    if len(parts) == 1:
+        parts = parts * 2
+    if len(parts) != 2 or min(parts) < 1:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected WxH")
+
+    return parts[0], parts[1]
+
+
+def parse_positive_int(value: str) -> int:
+    """
+    Parse a count that must be at least 1.
+    Meant to be used as an argparse type.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid value '{value}', expected a positive integer")
+
+    return number
+
+
+def parse_non_negative_int(value: str) -> int:
+    """
+    Parse a count where 0 means off.
+    Meant to be used as an argparse type.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"invalid value '{value}', expected 0 or a positive integer")
+
+    return number
+
+
+def parse_positive_float(value: str) -> float:
+    """
+    Parse a finite number that must be greater than 0, such as a time
+    interval. Meant to be used as an argparse type.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+
+    if not (number > 0 and math.isfinite(number)):
+        raise argparse.ArgumentTypeError(f"invalid value '{value}', expected a positive number")
+
+    return number
+
+
+def parse_crop(value: str) -> str:
+    """
+    Parse a crop mode, or a crop box given as "W:H:X:Y" like ffmpeg's crop
+    filter. Meant to be used as an argparse type.
+    """
+    if value in CROP_MODES:
+        return value
+    try:
+        w, h, x, y = (int(p) for p in value.split(":"))
+    except ValueError:
+        w = h = x = y = -1
+
+    if min(w, h) < 1 or min(x, y) < 0:
+        raise argparse.ArgumentTypeError(
+            f"invalid crop '{value}', expected {', '.join(CROP_MODES)} or W:H:X:Y"
+        )
+
+    return f"{w}:{h}:{x}:{y}"
+
+
+def cache_dir() -> Path:
+    """
+    Directory for persistent caches shared between runs.
+    Defaults to ~/.cache/cinechroma, override with CINECHROMA_CACHE_DIR.
+    """
+    path = os.environ.get("CINECHROMA_CACHE_DIR")
+    return Path(path) if path else Path.home() / ".cache" / "cinechroma"
+
+
+def parse_bytes(value: str) -> int:
+    """
+    Parse a byte count such as "500M" or "10G" (powers of 1024).
+    Meant to be used as an argparse type.
+    """
+    units = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    text = value.strip().upper().removesuffix("B")
+    number, unit = (text[:-1], text[-1]) if text and text[-1] in units else (text, "")
+
+    try:
+        return int(float(number) * units[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected e.g. 500M or 10G")
+
+
+def video_fingerprint(path: str, sample: int = 1 << 20) -> str:
+    """
+    Identify a video file by size, mtime and a hash of its first and last
+    `sample` bytes, without reading the whole file.
+    """
+    st = os.stat(path)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+
+    with open(path, "rb") as f:
+        h.update(f.read(sample))
+        if st.st_size > sample:
+            f.seek(max(sample, st.st_size - sample))
+            h.update(f.read(sample))
+
+    return h.hexdigest()